@@ -1,7 +1,11 @@
 import streamlit as st
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
 
+profiler = PageProfiler("app")
 st.title("Module 8: Best Practices & Projects")
 
+profiler.section("Day 29")
 # Day 29: Best Practices & Project Structure
 st.header("Day 29: Best Practices & Project Structure")
 st.write("""
@@ -41,6 +45,7 @@ st.info("A well-structured project is easier to debug, extend, and share!")
 
 st.markdown("---")
 
+profiler.section("Day 30")
 # Day 30: Build & Share Your Own Project
 st.header("Day 30: Build & Share Your Own Project")
 st.write("""
@@ -75,4 +80,8 @@ st.markdown("""
 st.info("""
 Streamlit is best for small to medium-sized apps, internal tools, prototypes, and data-driven applications where quick development and interactivity are important.
 """)
-st.markdown("---")  # End of Module 8
\ No newline at end of file
+st.markdown("---")  # End of Module 8
+
+leak_panel("app")
+
+profiler.finish()
@@ -0,0 +1,62 @@
+"""Import-time profile per page, each measured in a fresh interpreter.
+
+For every page a new Python process runs the script once through
+``AppTest`` and reports which deferred imports ran (from ``utils.lazy``),
+how long they took, and how many modules the run pulled in overall:
+
+    python -m benchmarks.import_profile --output import_profile.json
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from benchmarks.run import DEFAULT_PAGES, ROOT
+
+WORKER = """
+import json, sys, time
+from benchmarks.stubs import stub_network
+from streamlit.testing.v1 import AppTest
+from utils.lazy import import_profile
+
+page = sys.argv[1]
+modules_before = len(sys.modules)
+start = time.perf_counter()
+with stub_network():
+    AppTest.from_file(page, default_timeout=120).run()
+print(json.dumps({
+    "first_run_seconds": time.perf_counter() - start,
+    "modules_loaded": len(sys.modules) - modules_before,
+    "imports": import_profile(),
+}))
+"""
+
+
+def profile_page(page):
+    result = subprocess.run(
+        [sys.executable, "-c", WORKER, page],
+        cwd=ROOT, capture_output=True, text=True, env={**os.environ, "MEDIA_SERVER_PORT": "0"},
+    )
+    if result.returncode != 0:
+        return {"error": result.stderr.strip().splitlines()[-1:]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", default=DEFAULT_PAGES)
+    parser.add_argument("--output", default="import_profile.json")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for page in args.pages:
+        print(f"Profiling imports for {page}...")
+        report[page] = profile_page(page)
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+"""Concurrent-session load test over Streamlit's websocket protocol.
+
+Starts the app in a subprocess (with outbound HTTP served from
+``benchmarks/data``), opens N simulated browser sessions per page on
+``/_stcore/stream`` and drives scripted widget interactions on each one. For
+every concurrency level it records throughput, rerun latency percentiles,
+server-side saturation (event-loop lag measured as health-check latency,
+and the server's thread count) and RSS. The server's memo database, dataset
+cache and submissions database live in a temporary directory, so every run
+starts cold and leaves ``data/`` untouched; section timings are not logged.
+
+Needs ``websockets`` (and optionally ``psutil`` for RSS and threads):
+
+    python -m benchmarks.load_test --sessions 1,4,16 --output load_report.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ClientState_pb2 import ClientState
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+from streamlit.proto.WidgetStates_pb2 import WidgetState
+from benchmarks.run import ROOT, git_commit, isolated_environ, summarize
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+try:
+    import websockets
+except ImportError:
+    websockets = None
+
+# (widget kind, label, values cycled through by each session). Buttons take
+# no value. The interactions favour the code paths that hold script threads.
+INTERACTIONS = {
+    "app.py": [],
+    "pages/module1-3.py": [
+        ("slider", "Select your age", [30, 40, 50]),
+        ("text_input", "Enter your name", ["Load", "Test"]),
+    ],
+    "pages/module4.py": [
+        ("number_input", "Enter a number to square", list(range(11, 100))),
+        ("slider", "Number of rows to load", [1000, 2000, 3000]),
+        ("slider", "Zoom level", [10, 12, 14]),
+    ],
+    "pages/module5.py": [
+        ("button", "Start operation", None),
+        ("button", "Load data", None),
+    ],
+    "pages/module6.py": [
+        ("slider", "Number of rows", [2000, 3000, 4000]),
+        ("number_input", "Enter a number to divide 100 by:", [2, 4, 5]),
+    ],
+    "pages/module7.py": [
+        ("button", "Fetch Random User", None),
+    ],
+    "pages/day16.py": [
+        ("button", "Increment", None),
+    ],
+}
+
+DONE = (ForwardMsg.FINISHED_SUCCESSFULLY, ForwardMsg.FINISHED_WITH_COMPILE_ERROR)
+
+
+def page_name(page):
+    """URL path Streamlit serves ``page`` under (``""`` for the main script)."""
+    return "" if page == "app.py" else Path(page).stem
+
+
+def widget_state(kind, widget_id, value):
+    state = WidgetState(id=widget_id)
+    if kind == "button":
+        state.trigger_value = True
+    elif kind == "slider":
+        state.double_array_value.data.append(value)
+    elif kind == "number_input":
+        if isinstance(value, int):
+            state.int_value = value
+        else:
+            state.double_value = value
+    elif kind == "checkbox":
+        state.bool_value = value
+    else:
+        state.string_value = value
+    return state
+
+
+class Session:
+    """One simulated browser tab on a single page."""
+
+    def __init__(self, url, page):
+        self.url = url
+        self.page = page
+        self.widgets = {}
+        self.values = {}
+        self.errors = 0
+        self.ws = None
+
+    async def connect(self):
+        # Deltas carrying dataframes easily exceed the default 1 MiB frame limit.
+        self.ws = await websockets.connect(self.url, subprotocols=["streamlit"], max_size=None)
+
+    async def close(self):
+        if self.ws is not None:
+            await self.ws.close()
+
+    def _record(self, delta):
+        if delta.WhichOneof("type") != "new_element":
+            return
+        kind = delta.new_element.WhichOneof("type")
+        if kind == "exception":
+            self.errors += 1
+            return
+        element = getattr(delta.new_element, kind)
+        widget_id = getattr(element, "id", None)
+        if widget_id and getattr(element, "label", None):
+            self.widgets[(kind, element.label)] = widget_id
+
+    async def rerun(self, kind=None, label=None, value=None):
+        """Request a rerun, optionally changing one widget; return its latency."""
+        states = dict(self.values)
+        if kind is not None:
+            widget_id = self.widgets.get((kind, label))
+            if widget_id is None:
+                raise LookupError(f"No {kind} labelled {label!r} on {self.page}")
+            states[widget_id] = widget_state(kind, widget_id, value)
+            if kind != "button":
+                self.values[widget_id] = states[widget_id]
+
+        client_state = ClientState(query_string="", page_name=page_name(self.page))
+        client_state.widget_states.widgets.extend(states.values())
+        msg = BackMsg()
+        msg.rerun_script.CopyFrom(client_state)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        while True:
+            try:
+                data = await self.ws.recv()
+            except websockets.ConnectionClosed as e:
+                raise ConnectionError(f"Server closed the session on {self.page}") from e
+            fwd = ForwardMsg()
+            fwd.ParseFromString(data)
+            kind = fwd.WhichOneof("type")
+            if kind == "delta":
+                self._record(fwd.delta)
+            elif kind == "script_finished" and fwd.script_finished in DONE:
+                return time.perf_counter() - start
+
+
+class Monitor:
+    """Samples server RSS, thread count and event-loop lag while a level runs."""
+
+    def __init__(self, base_url, pid, interval=0.25):
+        self.health_url = f"{base_url}/_stcore/health"
+        self.process = psutil.Process(pid) if psutil else None
+        self.interval = interval
+        self.lag, self.rss, self.threads = [], [], []
+
+    def _health_check(self):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(self.health_url, timeout=10):
+                pass
+        except OSError:
+            pass
+        return time.perf_counter() - start
+
+    async def run(self):
+        while True:
+            self.lag.append(await asyncio.to_thread(self._health_check))
+            if self.process is not None:
+                self.rss.append(self.process.memory_info().rss)
+                self.threads.append(self.process.num_threads())
+            await asyncio.sleep(self.interval)
+
+    def report(self):
+        result = {"loop_lag": summarize(self.lag) if self.lag else None}
+        if self.rss:
+            result["rss_mb_max"] = round(max(self.rss) / (1024 * 1024), 1)
+            result["threads_max"] = max(self.threads)
+        return result
+
+
+async def drive(session, index, reruns, latencies):
+    steps = INTERACTIONS.get(session.page, [])
+    for step in range(reruns):
+        if steps:
+            kind, label, values = steps[(index + step) % len(steps)]
+            value = values[(index + step) % len(values)] if values else None
+        else:
+            kind = label = value = None
+        latencies.append(await session.rerun(kind, label, value))
+
+
+async def run_level(base_url, pid, page, sessions, reruns):
+    ws_url = base_url.replace("http", "ws", 1) + "/_stcore/stream"
+    monitor = Monitor(base_url, pid)
+    sampler = asyncio.create_task(monitor.run())
+    clients = [Session(ws_url, page) for _ in range(sessions)]
+    try:
+        await asyncio.gather(*(c.connect() for c in clients))
+        loads = await asyncio.gather(*(c.rerun() for c in clients))
+        latencies = []
+        start = time.perf_counter()
+        await asyncio.gather(*(drive(c, i, reruns, latencies) for i, c in enumerate(clients)))
+        elapsed = time.perf_counter() - start
+    finally:
+        sampler.cancel()
+        await asyncio.gather(*(c.close() for c in clients), return_exceptions=True)
+
+    result = {
+        "sessions": sessions,
+        "load": summarize(loads),
+        "reruns": summarize(latencies) if latencies else None,
+        "throughput_rps": round(len(latencies) / elapsed, 2) if elapsed else None,
+        "errors": sum(c.errors for c in clients),
+    }
+    result.update(monitor.report())
+    return result
+
+
+def start_server(port, storage_dir, timeout=60):
+    """Run the app in a subprocess and wait until it answers health checks."""
+    env = dict(os.environ, MEDIA_SERVER_PORT="0", **isolated_environ(storage_dir))
+    server = subprocess.Popen(
+        [sys.executable, "-m", "benchmarks.load_test", "--serve", "--port", str(port)], cwd=ROOT, env=env
+    )
+    health = f"http://127.0.0.1:{port}/_stcore/health"
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"Streamlit exited with code {server.returncode}")
+        try:
+            with urllib.request.urlopen(health, timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise TimeoutError(f"Streamlit did not become healthy on port {port}")
+
+
+def serve(port):
+    from streamlit.web import cli
+
+    from benchmarks.stubs import stub_network
+
+    with stub_network():
+        cli.main(
+            ["run", str(ROOT / "app.py"), "--server.headless", "true", "--server.port", str(port),
+             "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"],
+            prog_name="streamlit",
+        )
+
+
+def print_level(page, level):
+    reruns = level["reruns"] or {}
+    lag = level["loop_lag"] or {}
+    print(
+        f"{page:22} {level['sessions']:>8} {level['throughput_rps'] or 0:>8} "
+        f"{reruns.get('p50_ms', '-'):>9} {reruns.get('p95_ms', '-'):>9} {reruns.get('p99_ms', '-'):>9} "
+        f"{lag.get('p95_ms', '-'):>9} "
+        f"{level.get('threads_max', '-'):>7} {level.get('rss_mb_max', '-'):>8} {level['errors']:>6}"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", default=list(INTERACTIONS), help="Scripts to load, relative to the repo root")
+    parser.add_argument("--sessions", default="1,2,4,8,16", help="Comma-separated concurrency levels")
+    parser.add_argument("--reruns", type=int, default=10, help="Scripted interactions per session")
+    parser.add_argument("--port", type=int, default=8599, help="Port for the app under test")
+    parser.add_argument("--output", default="load_report.json", help="Where to write the JSON report")
+    parser.add_argument("--serve", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.serve:
+        serve(args.port)
+        return
+    if websockets is None:
+        sys.exit("The load test drives sessions over websockets. Install websockets: pip install websockets")
+    if psutil is None:
+        print("RSS and thread sampling disabled. Install psutil: pip install psutil")
+
+    levels = [int(n) for n in args.sessions.split(",")]
+    base_url = f"http://127.0.0.1:{args.port}"
+    report = {"commit": git_commit(), "reruns": args.reruns, "pages": {}}
+    storage = tempfile.TemporaryDirectory(prefix="load-")
+    server = start_server(args.port, storage.name)
+    try:
+        print(f"{'page':22} {'sessions':>8} {'rps':>8} {'p50_ms':>9} {'p95_ms':>9} {'p99_ms':>9} "
+              f"{'lag_p95':>9} {'threads':>7} {'rss_mb':>8} {'errors':>6}")
+        for page in args.pages:
+            report["pages"][page] = []
+            for sessions in levels:
+                level = asyncio.run(run_level(base_url, server.pid, page, sessions, args.reruns))
+                report["pages"][page].append(level)
+                print_level(page, level)
+    finally:
+        server.terminate()
+        server.wait(timeout=30)
+        storage.cleanup()
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}")
+
+
+if __name__ == "__main__":
+    main()
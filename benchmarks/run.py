@@ -0,0 +1,234 @@
+"""Headless per-page rerun latency benchmark.
+
+Runs every script through Streamlit's ``AppTest`` harness with outbound HTTP
+served from ``benchmarks/data``, and records cold-start and warm rerun
+latency percentiles, scripted interaction latency and peak Python memory per
+page. Results are written as JSON so runs can be compared across commits:
+
+    python -m benchmarks.run --output bench_report.json
+    python -m benchmarks.run --compare old_report.json
+
+Persistent caches (the memo database and the Parquet dataset cache) are
+pointed at a temporary directory and emptied together with the in-memory
+caches, so cold runs do not depend on what an earlier run left on disk.
+Form submissions go to a throwaway database there too, and the section
+timings log is disabled, so benchmarking never writes into ``data/`` or
+``logs/``.
+
+Before any page runs, a smoke query converts ``hw_200.csv`` and queries it
+through DuckDB, so a broken SQL setup fails the run instead of only showing
+up as a page exception.
+
+``--leaks N`` adds a pass per page that reruns it N times (cycling through
+its scripted interactions) and reports what grew; see ``utils.leaks``.
+"""
+import argparse
+import itertools
+import json
+import os
+import platform
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.scenarios import SCENARIOS
+from benchmarks.stubs import DATA_DIR, stub_network
+from utils.leaks import detect_leaks
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_PAGES = ["app.py"] + sorted(str(p.relative_to(ROOT)) for p in (ROOT / "pages").glob("*.py"))
+
+
+def summarize(samples):
+    ms = np.asarray(samples) * 1000
+    return {
+        "n": len(ms),
+        "mean_ms": round(float(ms.mean()), 2),
+        "p50_ms": round(float(np.percentile(ms, 50)), 2),
+        "p95_ms": round(float(np.percentile(ms, 95)), 2),
+        "p99_ms": round(float(np.percentile(ms, 99)), 2),
+    }
+
+
+def timed_run(at):
+    start = time.perf_counter()
+    at.run()
+    return time.perf_counter() - start
+
+
+def isolated_environ(directory):
+    """Environment pointing the app's on-disk state into ``directory``.
+
+    Covers the memo database, the dataset cache and the submissions database;
+    the section timings log is switched off.
+    """
+    return {
+        "MEMO_DB_PATH": os.path.join(directory, "memo.db"),
+        "DATASET_DIR": os.path.join(directory, "datasets"),
+        "SUBMISSIONS_DB_PATH": os.path.join(directory, "submissions.db"),
+        "SECTION_TIMINGS_LOG": "",
+    }
+
+
+def clear_caches():
+    """Reset every cache a page can warm, in memory and on disk."""
+    from utils import datasets, memo, swr
+
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    swr.clear_all()
+    memo.get_store().clear()
+    for path in datasets.DATASET_DIR.glob("*"):
+        path.unlink(missing_ok=True)
+
+
+def bench_page(page, runs, timeout):
+    result = {"exceptions": []}
+
+    clear_caches()
+    at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+    result["cold_ms"] = round(timed_run(at) * 1000, 2)
+    result["warm"] = summarize([timed_run(at) for _ in range(runs)])
+
+    interactions = {}
+    for name, action in SCENARIOS.get(page, []):
+        samples = []
+        for _ in range(runs):
+            action(at)
+            samples.append(timed_run(at))
+        interactions[name] = summarize(samples)
+    result["interactions"] = interactions
+    result["exceptions"] = [e.message for e in at.exception]
+
+    # Memory is measured in a separate pass so tracing overhead
+    # does not skew the latency numbers above.
+    clear_caches()
+    tracemalloc.start()
+    try:
+        at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+        at.run()
+        for _ in range(runs):
+            at.run()
+        result["peak_memory_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 2)
+    finally:
+        tracemalloc.stop()
+    return result
+
+
+def smoke_sql():
+    """Run the Day 20 query on a freshly converted dataset; raise if it fails."""
+    from utils import datasets, sql
+
+    if not sql.available():
+        return "skipped (duckdb not installed)"
+    key = datasets.csv_to_parquet((DATA_DIR / "hw_200.csv").read_bytes(), source="hw_200.csv")
+    result = sql.run_query(
+        'SELECT ROUND("Height(Inches)") AS height, COUNT(*) AS people FROM hw_200 GROUP BY 1',
+        {"hw_200": key},
+    )
+    if result["people"].sum() != 200:
+        raise AssertionError(f"SQL smoke query returned {result['people'].sum()} rows, expected 200")
+    return "ok"
+
+
+def leak_page(page, reruns, timeout):
+    """Rerun ``page`` ``reruns`` times and report resources that kept growing."""
+    clear_caches()
+    at = AppTest.from_file(str(ROOT / page), default_timeout=timeout)
+    at.run()
+    actions = [action for _, action in SCENARIOS.get(page, [])]
+    steps = itertools.count()
+
+    def rerun():
+        if actions:
+            actions[next(steps) % len(actions)](at)
+        at.run()
+
+    return detect_leaks(rerun, reruns)
+
+
+def print_leaks(page, leaks):
+    print(f"  traced {leaks['traced_mb'][0]} -> {leaks['traced_mb'][1]} MB, "
+          f"fds {leaks['open_fds'][0]} -> {leaks['open_fds'][1]}, "
+          f"figures {leaks['figures'][0]} -> {leaks['figures'][1]}, "
+          f"pyplot {leaks['pyplot_figures'][0]} -> {leaks['pyplot_figures'][1]}")
+    for site in leaks["growing_sites"][:5]:
+        print(f"  +{site['growth_kb']} KB ({site['grew_in']} reruns) {site['site']}")
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    """Print p50 deltas between two reports."""
+    print(f"{'page':28} {'metric':28} {'baseline':>10} {'current':>10} {'delta':>8}")
+    for page, current in report["pages"].items():
+        old = baseline["pages"].get(page)
+        if old is None:
+            continue
+        rows = [("cold_ms", old.get("cold_ms"), current.get("cold_ms")),
+                ("warm p50_ms", old["warm"]["p50_ms"], current["warm"]["p50_ms"])]
+        for name, stats in current["interactions"].items():
+            if name in old.get("interactions", {}):
+                rows.append((f"{name} p50_ms", old["interactions"][name]["p50_ms"], stats["p50_ms"]))
+        for metric, before, after in rows:
+            delta = f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+            print(f"{page:28} {metric:28} {before:>10} {after:>10} {delta:>8}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pages", nargs="*", default=DEFAULT_PAGES, help="Scripts to benchmark, relative to the repo root")
+    parser.add_argument("--runs", type=int, default=10, help="Warm reruns per page and per interaction")
+    parser.add_argument("--timeout", type=float, default=60, help="Per-run script timeout in seconds")
+    parser.add_argument("--output", default="bench_report.json", help="Where to write the JSON report")
+    parser.add_argument("--compare", help="Baseline report to diff against")
+    parser.add_argument("--leaks", type=int, default=0, metavar="N", help="Also rerun each page N times and report leaks")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT)
+    # Let the media server pick a free port for each benchmark process.
+    os.environ.setdefault("MEDIA_SERVER_PORT", "0")
+    # Keep benchmark runs away from (and independent of) the app's own caches.
+    storage = tempfile.TemporaryDirectory(prefix="bench-")
+    os.environ.update(isolated_environ(storage.name))
+    report = {
+        "commit": git_commit(),
+        "created": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "streamlit": st.__version__,
+        "runs": args.runs,
+        "pages": {},
+    }
+    report["smoke_sql"] = smoke_sql()
+    print(f"SQL smoke query: {report['smoke_sql']}")
+    with stub_network():
+        for page in args.pages:
+            print(f"Benchmarking {page}...")
+            report["pages"][page] = bench_page(page, args.runs, args.timeout)
+            if args.leaks:
+                leaks = leak_page(page, args.leaks, args.timeout)
+                report["pages"][page]["leaks"] = leaks
+                print_leaks(page, leaks)
+
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(f"Wrote {args.output}")
+    if args.compare:
+        compare(report, json.loads(Path(args.compare).read_text()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Scripted widget interactions for each page, keyed by script path."""
+
+
+def widget(at, kind, label):
+    """First widget of ``kind`` (e.g. ``"slider"``) whose label is ``label``."""
+    for w in getattr(at, kind):
+        if w.label == label:
+            return w
+    raise LookupError(f"No {kind} labelled {label!r}")
+
+
+def submit_user_form(at):
+    widget(at, "text_input", "Enter your name").input("Bench")
+    widget(at, "button", "Submit").click()
+
+
+def submit_feedback_form(at):
+    widget(at, "slider", "Rate your experience").set_value(5)
+    widget(at, "text_area", "Additional comments").input("Fast enough.")
+    widget(at, "button", "Send Feedback").click()
+
+
+def submit_search_form(at):
+    widget(at, "text_input", "Enter search term").input("streamlit")
+    widget(at, "button", "Search").click()
+
+
+def submit_auth_form(at):
+    widget(at, "text_input", "Username").input("user")
+    widget(at, "text_input", "Password").input("streamlit")
+    widget(at, "button", "Login").click()
+
+
+SCENARIOS = {
+    "app.py": [],
+    "pages/module1-3.py": [
+        ("age slider", lambda at: widget(at, "slider", "Select your age").set_value(40)),
+        ("color select", lambda at: widget(at, "selectbox", "Pick a color").select("Green")),
+        ("name input", lambda at: widget(at, "text_input", "Enter your name").input("Bench")),
+    ],
+    "pages/module4.py": [
+        ("day 13 rows slider", lambda at: widget(at, "slider", "Number of rows to load").set_value(2000)),
+        ("day 13 square", lambda at: widget(at, "number_input", "Enter a number to square").set_value(12)),
+        ("day 14 zoom", lambda at: widget(at, "slider", "Zoom level").set_value(14)),
+    ],
+    "pages/module5.py": [
+        ("user form", submit_user_form),
+        ("feedback form", submit_feedback_form),
+        ("search form", submit_search_form),
+    ],
+    "pages/module6.py": [
+        ("day 24 rows slider", lambda at: widget(at, "slider", "Number of rows").set_value(2000)),
+        ("day 23 divide", lambda at: widget(at, "number_input", "Enter a number to divide 100 by:").set_value(4)),
+    ],
+    "pages/module7.py": [
+        ("fetch random user", lambda at: widget(at, "button", "Fetch Random User").click()),
+        ("auth form", submit_auth_form),
+    ],
+    "pages/day16.py": [
+        ("increment", lambda at: widget(at, "button", "Increment").click()),
+    ],
+}
@@ -0,0 +1,48 @@
+"""Serve outbound HTTP from local fixture files during benchmarks."""
+import contextlib
+import mimetypes
+from pathlib import Path
+from unittest import mock
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DATA_DIR = Path(__file__).resolve().parent / "data"
+
+FIXTURES = {
+    "https://people.sc.fsu.edu/~jburkardt/data/csv/airtravel.csv": "airtravel.csv",
+    "https://people.sc.fsu.edu/~jburkardt/data/csv/hw_200.csv": "hw_200.csv",
+    "https://randomuser.me/api/": "randomuser.json",
+    "https://assets2.lottiefiles.com/packages/lf20_touohxv0.json": "lottie.json",
+}
+
+
+def fixture_response(request):
+    """Build a ``requests.Response`` for ``request`` from the fixture table."""
+    response = requests.Response()
+    response.request = request
+    response.url = request.url
+    name = FIXTURES.get(request.url.split("?", 1)[0])
+    if name is None:
+        response.status_code = 404
+        response._content = b""
+        response._content_consumed = True
+        return response
+    path = DATA_DIR / name
+    response.status_code = 200
+    response._content = path.read_bytes()
+    # No raw socket behind this response; mark the body as already read.
+    response._content_consumed = True
+    response.headers["Content-Type"] = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    response.headers["Content-Length"] = str(len(response._content))
+    return response
+
+
+@contextlib.contextmanager
+def stub_network():
+    """Route every ``requests`` call to local fixtures; unknown URLs get a 404."""
+    def send(self, request, **kwargs):
+        return fixture_response(request)
+
+    with mock.patch.object(HTTPAdapter, "send", send):
+        yield
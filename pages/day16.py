@@ -1,5 +1,10 @@
 import streamlit as st
+from utils.session_memory import DEFAULT_POLICY, session_memory_panel
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
+profiler = PageProfiler("day16")
 st.title("Module 5: App Structure & State")
+profiler.section("Day 16")
 st.header("Day 16: Session State")
 
 st.write("""
@@ -22,4 +27,12 @@ if reset:
 st.write(f"Counter value: {st.session_state.counter}")
 st.info("Try clicking the buttons above. The counter value will persist across reruns!")
 
-st.markdown("---")  # End of Day 16
\ No newline at end of file
+# Sidebar panel showing how much memory this session's state holds.
+# Past 50 MB, large entries are spilled to disk oldest first; small values such as the counter stay in memory.
+session_memory_panel(DEFAULT_POLICY)
+
+st.markdown("---")  # End of Day 16
+
+leak_panel("day16")
+
+profiler.finish()
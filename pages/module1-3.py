@@ -1,18 +1,30 @@
 import streamlit as st
 from datetime import date
 import datetime
+import time
 import pandas as pd
-import numpy as np
+from utils.batch import DEFAULT_MAX_WORKERS, batch_report, iter_parsed
+from utils.datasets import csv_to_parquet
+from utils.ingest import DEFAULT_MEMORY_LIMIT_MB, render_csv_stream
+from utils.media import media_source
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
+from utils.session_memory import DEFAULT_POLICY, session_memory_panel
+from utils.sql import sql_query_panel
+from utils.synthetic import generate
 
+profiler = PageProfiler("module1-3")
 # ---------------- Module 1: Getting Started ----------------
 st.title("Module 1: Getting Started")
 
+profiler.section("Day 1")
 # Day 1: Introduction & Installation
 st.header("Day 1: Introduction & Installation")
 st.title("Hello, Streamlit!")
 st.write("Welcome to Day 1 of the 30 Days of Streamlit Challenge.")
 st.markdown("---")
 
+profiler.section("Day 2")
 # Day 2: First App & Basic Elements
 st.header("Day 2: First App & Basic Elements")
 st.header("Welcome to Day 2!")
@@ -33,6 +45,7 @@ st.write([1, 2, 3, 4, 5])
 st.write({"name": "Alice", "age": 30})
 st.markdown("---")
 
+profiler.section("Day 3")
 # Day 3: Text Elements
 st.header("Day 3: Text Elements")
 st.header("This is a Header")
@@ -56,6 +69,7 @@ st.markdown("---")
 # ---------------- Module 2: Data Display ----------------
 st.title("Module 2: Data Display")
 
+profiler.section("Day 4")
 # Day 4: DataFrames & Tables
 st.header("Day 4: DataFrames & Tables")
 data = {
@@ -69,16 +83,14 @@ st.dataframe(df)
 st.header("st.table (static)")
 st.table(df)
 st.header("Random DataFrame Example")
-random_df = pd.DataFrame(
-    np.random.randn(10, 3),
-    columns=["A", "B", "C"]
-)
+random_df = generate("tabular", 10, seed=4, columns=["A", "B", "C"])
 st.dataframe(random_df)
 st.markdown("---")
 
 # ---------------- Module 3: Interactivity ----------------
 st.title("Module 3: Interactivity")
 
+profiler.section("Day 5")
 # Day 5: Images, Audio, Video, File Uploads
 st.header("Day 5: Images, Audio, Video, File Uploads")
 st.header("Display Image")
@@ -88,26 +100,44 @@ st.image(
     width=300
 )
 st.header("Play Audio")
-try:
-    audio_file = open("media/sample_audio.mp3", "rb")  # Make sure this file exists
-    st.audio(audio_file, format="audio/mp3")
-except Exception:
+# Media is served by URL with HTTP Range support instead of copying the file per session
+# (falling back to the file's bytes when the media server cannot be reached)
+audio_source = media_source("sample_audio.mp3")
+if audio_source:
+    st.audio(audio_source, format="audio/mp3")
+else:
     st.info("sample_audio.mp3 not found.")
 st.header("Play Video")
-try:
-    video_file = open("media/sample_video.mp4", "rb")  # Make sure this file exists
-    st.video(video_file)
-except Exception:
+video_source = media_source("sample_video.mp4")
+if video_source:
+    st.video(video_source)
+else:
     st.info("sample_video.mp4 not found.")
 st.title("File Uploader Example")
+memory_limit_mb = st.number_input(
+    "Memory ceiling for CSV parsing (MB)",
+    min_value=16,
+    max_value=4096,
+    value=DEFAULT_MEMORY_LIMIT_MB,
+    help="CSV files larger than this are read in chunks instead of all at once."
+)
 uploaded_file = st.file_uploader("Choose a file")
 if uploaded_file is not None:
     st.write("Filename:", uploaded_file.name)
     if uploaded_file.type.startswith("image"):
         st.image(uploaded_file)
     elif uploaded_file.type == "text/csv":
-        df = pd.read_csv(uploaded_file)
-        st.dataframe(df)
+        if uploaded_file.size > memory_limit_mb * 1024 * 1024:
+            render_csv_stream(uploaded_file, memory_limit_mb)
+        else:
+            df = pd.read_csv(uploaded_file)
+            st.dataframe(df)
+        with st.expander("Query with SQL"):
+            # Converting copies the whole upload to Parquet, so only do it on request
+            # (once per uploaded file), then query it out-of-core.
+            if st.checkbox("Enable SQL (converts the file to Parquet)", key="upload_sql_enabled"):
+                upload_dataset = csv_to_parquet(uploaded_file, source=uploaded_file.name, content_id=uploaded_file.file_id)
+                sql_query_panel({"upload": upload_dataset}, "SELECT * FROM upload LIMIT 100", key="upload_sql")
     else:
         st.write("File type:", uploaded_file.type)
 st.title("Multiple File Upload Example")
@@ -115,18 +145,31 @@ uploaded_files = st.file_uploader(
     "Choose files",
     accept_multiple_files=True
 )
+max_workers = st.slider("Parallel parsers", 1, 32, DEFAULT_MAX_WORKERS)
 if uploaded_files:
-    for uploaded_file in uploaded_files:
-        st.write("Filename:", uploaded_file.name)
-        if uploaded_file.type.startswith("image"):
-            st.image(uploaded_file)
-        elif uploaded_file.type == "text/csv":
-            df = pd.read_csv(uploaded_file)
-            st.dataframe(df)
+    batch_start = time.perf_counter()
+    results = []
+    for parsed, uploaded_file in zip(iter_parsed(uploaded_files, memory_limit_mb, max_workers), uploaded_files):
+        results.append(parsed)
+        st.write("Filename:", parsed.name)
+        if parsed.error is not None:
+            st.error(f"Could not parse {parsed.name}.")
+            st.exception(parsed.error)
+        elif parsed.kind == "image":
+            st.image(parsed.payload)
+        elif parsed.kind == "csv":
+            st.dataframe(parsed.payload)
+        elif parsed.kind == "csv_stream":
+            render_csv_stream(uploaded_file, memory_limit_mb)
         else:
-            st.write("File type:", uploaded_file.type)
+            st.write("File type:", parsed.payload)
+    timings, throughput = batch_report(results, time.perf_counter() - batch_start)
+    with st.expander("Batch timings"):
+        st.dataframe(timings)
+        st.write(throughput)
 st.markdown("---")
 
+profiler.section("Day 6")
 # Day 6: Button and Checkbox
 st.header("Day 6: Button and Checkbox")
 if st.button("Click Me!"):
@@ -146,6 +189,7 @@ except Exception as e:
     st.exception(e)
 st.markdown("---")
 
+profiler.section("Day 7")
 # Day 7: Sliders & Selectboxes
 st.header("Day 7: Sliders & Selectboxes")
 st.title("Slider Examples")
@@ -182,6 +226,7 @@ else:
     st.info(f"{color} selected!")
 st.markdown("---")
 
+profiler.section("Day 8")
 # Day 8: Text, Number, Date Inputs
 st.header("Day 8: Text, Number, Date Inputs")
 name = st.text_input("Enter your name")
@@ -193,6 +238,7 @@ birthday = st.date_input("Select your birthday", value=date(2000, 1, 1))
 st.write(f"Your birthday is: {birthday}")
 st.markdown("---")
 
+profiler.section("Day 9")
 # Day 9: Layouts (Columns, Expander, Sidebar)
 st.header("Day 9: Layouts (Columns, Expander, Sidebar)")
 col1, col2 = st.columns(2)
@@ -226,4 +272,11 @@ if st.sidebar.button("Click me!"):
 uploaded = st.sidebar.file_uploader("Upload a file")
 if uploaded:
     st.sidebar.write("File uploaded:", uploaded.name)
-st.markdown("---")
\ No newline at end of file
+st.markdown("---")
+
+# Keep this session's state (streamed CSV previews and stats) under the memory cap
+session_memory_panel(DEFAULT_POLICY)
+
+leak_panel("module1-3")
+
+profiler.finish()
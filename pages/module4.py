@@ -1,10 +1,25 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import numpy as np
-import altair as alt
-import pandas as pd
 import time
+from utils.lazy import import_profile_panel, lazy_import
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
+
+# Heavy libraries are only imported once a section actually uses them
+np = lazy_import("numpy", page="module4")
+pd = lazy_import("pandas", page="module4")
+alt = lazy_import("altair", page="module4")
+figures = lazy_import("utils.figures", page="module4")
+chart_data = lazy_import("utils.chart_data", page="module4")
+swr = lazy_import("utils.swr", page="module4")
+cache_stats = lazy_import("utils.cache_stats", page="module4")
+memo = lazy_import("utils.memo", page="module4")
+synthetic = lazy_import("utils.synthetic", page="module4")
+geo = lazy_import("utils.geo", page="module4")
+datasets = lazy_import("utils.datasets", page="module4")
+prerender = lazy_import("utils.prerender", page="module4")
+profiler = PageProfiler("module4")
 st.title("Module 4: Visualization")
+profiler.section("Day 11")
 st.header("Day 11: Plotting with Matplotlib")
 
 # Generate some data
@@ -13,17 +28,19 @@ y = np.sin(x)
 y2 = np.cos(x)
 
 # Create a matplotlib figure
-fig, ax = plt.subplots()
-ax.plot(x, y, label="sin(x)")
-ax.plot(x, y2, label="cos(x)", linestyle="--")
-ax.set_xlabel("x")
-ax.set_ylabel("Value")
-ax.set_title("Sine and Cosine Waves")
-ax.legend()
-
-# Display the plot in Streamlit
-st.pyplot(fig)
-
+def plot_waves(ax, x, y, y2):
+    ax.plot(x, y, label="sin(x)")
+    ax.plot(x, y2, label="cos(x)", linestyle="--")
+    ax.set_xlabel("x")
+    ax.set_ylabel("Value")
+    ax.set_title("Sine and Cosine Waves")
+    ax.legend()
+
+# Display the plot in Streamlit. The rendered PNG is cached on a hash of the
+# inputs, so reruns reuse the bytes instead of redrawing the figure.
+st.image(figures.render_figure(plot_waves, x, y, y2))
+
+profiler.section("Day 11 (monthly sales)")
 st.header("Day 11: Realistic Example - Monthly Sales Data")
 # Example data
 months = [
@@ -46,20 +63,23 @@ product_b_sales = [100, 115, 130, 140, 150, 160, 170, 180, 175, 190, 200, 210]
 # 'p' : Pentagon
 # 'h' : Hexagon
 # Create a matplotlib figure
-fig, ax = plt.subplots()
-ax.plot(months, product_a_sales, marker='x', label="Product A")
-ax.plot(months, product_b_sales, marker='o', label="Product B")
-ax.set_xlabel("Month")
-ax.set_ylabel("Sales")
-ax.set_title("Monthly Sales Data (Product A vs Product B)")
-ax.legend()
-ax.grid(True)
-
-# Display the plot in Streamlit
-st.pyplot(fig)
+def plot_monthly_sales(ax, months, product_a_sales, product_b_sales):
+    ax.plot(months, product_a_sales, marker='x', label="Product A")
+    ax.plot(months, product_b_sales, marker='o', label="Product B")
+    ax.set_xlabel("Month")
+    ax.set_ylabel("Sales")
+    ax.set_title("Monthly Sales Data (Product A vs Product B)")
+    ax.legend()
+    ax.grid(True)
+
+# Display the plot in Streamlit. The inputs never change, so the chart is
+# rendered to a PNG once and served from the static directory.
+monthly_sales_url = prerender.static_figure("monthly_sales", plot_monthly_sales, months, product_a_sales, product_b_sales)
+st.markdown(f"![Monthly Sales Data]({monthly_sales_url})")
 
 st.markdown("---")  # End of Day 11
 
+profiler.section("Day 12")
 st.header("Day 12: Plotting with Altair")
 
 # Example data
@@ -70,28 +90,37 @@ months = [
 product_a_sales = [120, 135, 150, 170, 160, 180, 200, 210, 190, 220, 230, 250]
 product_b_sales = [100, 115, 130, 140, 150, 160, 170, 180, 175, 190, 200, 210]
 
-# Prepare data for Altair
-df = pd.DataFrame({
-    "Month": months * 2,
-    "Sales": product_a_sales + product_b_sales,
-    "Product": ["A"] * 12 + ["B"] * 12
-})
-
-# Create Altair chart
-chart = alt.Chart(df).mark_line(point=True).encode(
-    x="Month",
-    y="Sales",
-    color="Product",
-    tooltip=["Month", "Product", "Sales"]
-).properties(
-    title="Monthly Sales Data (Product A vs Product B)"
-)
+def build_sales_chart(months, product_a_sales, product_b_sales):
+    # Prepare data for Altair
+    df = pd.DataFrame({
+        "Month": months * 2,
+        "Sales": product_a_sales + product_b_sales,
+        "Product": ["A"] * 12 + ["B"] * 12
+    })
 
-st.altair_chart(chart, use_container_width=True)
+    # Aggregate on the server so only one row per (Month, Product) reaches the chart,
+    # however many raw sales rows there are.
+    chart_df = chart_data.aggregate_for_chart(df, x="Month", y="Sales", color="Product", aggregate="sum")
+
+    # Create Altair chart
+    return alt.Chart(chart_df).mark_line(point=True).encode(
+        x="Month",
+        y="Sales",
+        color="Product",
+        tooltip=["Month", "Product", "Sales"]
+    ).properties(
+        title="Monthly Sales Data (Product A vs Product B)"
+    )
+
+# The chart only depends on the constant lists above, so its Vega-Lite spec
+# is built once and reused by every rerun and session.
+chart_spec = prerender.static_vega_spec("monthly_sales_altair", build_sales_chart, months, product_a_sales, product_b_sales)
+st.vega_lite_chart(chart_spec, use_container_width=True)
 
 st.markdown("---")  # End of Day 12
 
 st.title("Module 4: Visualization")
+profiler.section("Day 13")
 st.header("Day 13: Caching with @st.cache_data")
 
 st.write("""
@@ -100,13 +129,11 @@ When you use this decorator, Streamlit stores the function's output and reuses i
 """)
 
 # Example: Simulate expensive data loading
-@st.cache_data
+@profiler.timed
+@cache_stats.observed_cache_data()
 def load_data(rows=1000):
     st.write("Loading data... (this should appear only once unless you change the input)")
-    return pd.DataFrame({
-        "A": np.random.randn(rows),
-        "B": np.random.rand(rows)
-    })
+    return synthetic.generate("tabular", rows, seed=13, columns={"A": "normal", "B": "uniform"})
 
 num_rows = st.slider("Number of rows to load", 100, 5000, 1000, step=100)
 df = load_data(num_rows)
@@ -117,14 +144,19 @@ st.info("Change the slider to see the function rerun. If you keep the same value
 # Another example: Caching data from a CSV file
 st.subheader("Example: Caching CSV file loading")
 
-@st.cache_data
-def load_csv(url):
-    st.write("Reading CSV from URL... (this should appear only once per URL)")
-    return pd.read_csv(url)
+# Stale-while-revalidate: after 10 minutes the cached dataset is still served
+# instantly while one background request checks whether the file changed.
+# Each CSV is converted to a local Parquet file once and read from there.
+@profiler.timed
+@swr.swr_cache(ttl=600)
+def load_csv(content):
+    return datasets.csv_to_parquet(content)
 
 csv_url = st.text_input("Enter a CSV URL to load", "https://people.sc.fsu.edu/~jburkardt/data/csv/airtravel.csv")
 if csv_url:
-    csv_df = load_csv(csv_url)
+    if csv_url not in load_csv.cache.entries:
+        st.write("Reading CSV from URL... (this should appear only once per URL)")
+    csv_df = datasets.read_dataset(load_csv(csv_url))
     st.dataframe(csv_df.head())
 
 st.info("Change the URL to reload. If you keep the same URL, the cached result is used!")
@@ -133,7 +165,10 @@ st.info("Change the URL to reload. If you keep the same URL, the cached result i
 st.subheader("Example: Caching a slow computation")
 
 
-@st.cache_data
+# Results also persist on disk, so restarts and other workers reuse them
+@profiler.timed
+@cache_stats.observed_cache_data()
+@memo.persistent_memo()
 def slow_square(x):
     st.write(f"Computing square of {x} (this should appear only once per value)...")
     time.sleep(2)  # Simulate a slow computation
@@ -145,6 +180,7 @@ st.write(f"Square of {number} is {result}")
 
 st.markdown("---")  # End of Day 13
 
+profiler.section("Day 14")
 st.header("Day 14: Maps & Geospatial")
 
 st.write("""
@@ -153,16 +189,38 @@ You can display points on a map by providing a DataFrame with latitude and longi
 """)
 
 # Generate random geospatial data (e.g., points around a city center)
-num_points = st.slider("Number of points", 10, 200, 50)
+num_points = st.select_slider(
+    "Number of points",
+    options=[50, 200, 1_000, 10_000, 100_000, 1_000_000],
+    value=1_000
+)
+zoom = st.slider("Zoom level", 8, 16, 12)
 city_center = [10.7769, 106.7009]  # Ho Chi Minh City, Vietnam
 
-map_data = pd.DataFrame({
-    "lat": np.random.normal(city_center[0], 0.01, num_points),
-    "lon": np.random.normal(city_center[1], 0.01, num_points)
-})
+@profiler.timed
+@st.cache_resource
+def load_point_index(num_points):
+    points = synthetic.generate("geospatial", num_points, seed=14, center=city_center, spread=0.01)
+    return geo.GridIndex(points["lat"], points["lon"])
+
+# Only the bins visible at this zoom level are sent to the browser,
+# no matter how many points are in the index. Binning is cached per
+# (points, zoom) so unrelated reruns of the page do not redo it.
+@profiler.timed
+@st.cache_data(max_entries=64)
+def load_map_bins(num_points, zoom):
+    return load_point_index(num_points).binned(city_center, zoom)
 
-st.map(map_data)
+map_data = load_map_bins(num_points, zoom)
+st.map(map_data, latitude="lat", longitude="lon", size="size", zoom=zoom)
+st.caption(f"{num_points:,} points shown as {len(map_data):,} bins.")
 
 st.info("You can use your own latitude/longitude data for custom maps!")
 
-st.markdown("---")  # End of Day 14
\ No newline at end of file
+st.markdown("---")  # End of Day 14
+
+import_profile_panel("module4")
+
+leak_panel("module4")
+
+profiler.finish()
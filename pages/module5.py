@@ -1,6 +1,13 @@
 import streamlit as st
 import time
+import pandas as pd
+from utils.jobs import current_session_id, get_runner
+from utils.submissions import get_store
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
+profiler = PageProfiler("module5")
 st.title("Module 5: App Structure & State")
+profiler.section("Day 15")
 st.header("Day 15: Progress Bars & Status")
 
 st.write("""
@@ -8,24 +15,76 @@ Streamlit provides simple ways to show progress and status updates in your app.
 You can use `st.progress` for progress bars and `st.spinner` for loading indicators.
 """)
 
+# Long tasks run in a background job runner so reruns (and every other widget)
+# stay responsive. Progress is polled by a fragment twice a second.
+runner = get_runner()
+session_id = current_session_id()
+
+def long_operation(job):
+    for percent_complete in range(100):
+        time.sleep(0.01)  # Simulate a long operation
+        job.report((percent_complete + 1) / 100, f"Completed {percent_complete + 1}% of the operation.")
+    return "Operation completed!"
+
+def load_data(job):
+    job.report(0, "Loading data...")
+    time.sleep(1)
+    return "Data loaded successfully!"
+
+def start_job(name, fn):
+    # Only the latest result per example is kept; older finished runs are dismissed.
+    for job in runner.jobs(session_id):
+        if job.name == name:
+            runner.dismiss(job.id)
+    runner.submit(session_id, name, fn)
+
 # Progress bar example
 st.subheader("Progress Bar Example")
-progress_text = "Operation in progress. Please wait."
-progress_bar = st.progress(0, text=progress_text)
-for percent_complete in range(100):
-    time.sleep(0.01)  # Simulate a long operation
-    progress_text = f"Completed {percent_complete + 1}% of the operation."
-    progress_bar.progress(percent_complete + 1, text=progress_text)
-st.success("Operation completed!")
+if st.button("Start operation"):
+    start_job("Progress bar example", long_operation)
 
 # Spinner example
 st.subheader("Spinner Example")
-with st.spinner("Loading data..."):
-    time.sleep(1)
-st.info("Data loaded successfully!")
+if st.button("Load data"):
+    start_job("Spinner example", load_data)
+
+def is_active(job):
+    return job.status in ("queued", "running")
+
+# Poll only while this session has work in flight; an idle tab does not rerun.
+jobs_active = any(is_active(job) for job in runner.jobs(session_id))
+
+@st.fragment(run_every=0.5 if jobs_active else None)
+def show_jobs():
+    jobs = runner.jobs(session_id)
+    for job in jobs:
+        if is_active(job):
+            col1, col2 = st.columns([4, 1])
+            if job.name == "Spinner example":
+                col1.info(f"⏳ {job.message or 'Loading data...'}")
+            else:
+                col1.progress(job.progress, text=job.message or "Operation in progress. Please wait.")
+            if col2.button("Cancel", key=f"cancel_job_{job.id}"):
+                runner.cancel(job.id)
+            continue
+        col1, col2 = st.columns([4, 1])
+        if job.status == "done":
+            col1.success(job.result)
+        elif job.status == "cancelled":
+            col1.warning(f"{job.name} was cancelled.")
+        else:
+            col1.error(f"{job.name} failed.")
+            col1.exception(job.error)
+        col2.button("Dismiss", key=f"dismiss_job_{job.id}", on_click=runner.dismiss, args=(job.id,))
+    if jobs_active and not any(is_active(job) for job in jobs):
+        # The last job finished: rerun the page once so polling stops.
+        st.rerun()
+
+show_jobs()
 
 st.markdown("---")  # End of Day 15
 
+profiler.section("Day 17")
 st.header("Day 17: Using Forms")
 
 st.write("""
@@ -39,6 +98,7 @@ with st.form("user_form"):
     submitted = st.form_submit_button("Submit")
 
 if submitted:
+    get_store().submit("user_form", {"name": name, "age": age})
     st.success(f"Hello, {name}! You are {age} years old.")
 
 st.info("All widgets inside the form are only processed when you click 'Submit'.")
@@ -64,6 +124,7 @@ with st.form("feedback_form"):
     comments = st.text_area("Additional comments")
     send = st.form_submit_button("Send Feedback")
 if send:
+    get_store().submit("feedback_form", {"rating": rating, "comments": comments})
     st.success("Thank you for your feedback!")
     st.write("Rating:", rating)
     st.write("Comments:", comments)
@@ -76,9 +137,24 @@ with st.form("search_form"):
     query = st.text_input("Enter search term")
     search = st.form_submit_button("Search")
 if search:
+    get_store().submit("search_form", {"query": query})
     st.info(f"Searching for: {query}")
 
+# Dashboard reads aggregates that the background writer keeps up to date
+@profiler.timed
+@st.cache_data(ttl=5)
+def load_feedback_stats():
+    store = get_store()
+    return store.rating_histogram("feedback_form"), store.hourly_counts()
+
+with st.expander("Submissions dashboard"):
+    ratings, recent = load_feedback_stats()
+    st.write("Feedback ratings:")
+    st.bar_chart(pd.Series({r: ratings.get(r, 0) for r in range(1, 6)}, name="Submissions"))
+    st.write("Submissions in the last 24 hours:", recent)
+
 st.markdown("---")  # End of Day 17
+profiler.section("Day 18")
 st.header("Day 18: Multi-Page Apps")
 
 st.write("""
@@ -112,6 +188,7 @@ st.info("Try adding new Python files to your `pages` folder and see them appear
 
 st.markdown("---")  # End of Day 18
 
+profiler.section("Day 19")
 st.header("Day 19: Customizing Themes")
 
 st.write("""
@@ -139,3 +216,7 @@ You can also switch between "light" and "dark" modes in the app settings menu.
 """)
 
 st.info("Try editing `.streamlit/config.toml` to see your app's appearance change!")
+
+leak_panel("module5")
+
+profiler.finish()
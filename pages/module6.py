@@ -1,11 +1,19 @@
 import streamlit as st
-import pandas as pd
 import time
-from st_aggrid import AgGrid, GridOptionsBuilder
-from streamlit_tags import st_tags
-import numpy as np
-
+from utils.cache_stats import cache_diagnostics, observed_cache_data
+from utils.datasets import csv_to_parquet, dataset_schema, read_dataset
+from utils.lazy import import_profile_panel, optional_import
+from utils.memo import persistent_memo
+from utils.paging import RowServer
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
+from utils.sql import sql_query_panel
+from utils.swr import swr_cache
+from utils.synthetic import generate
+
+profiler = PageProfiler("module6")
 st.title("Module 6: Advanced Features")
+profiler.section("Day 20")
 st.header("Day 20: Caching - Real World Example")
 
 st.write("""
@@ -13,25 +21,45 @@ Suppose you have a large CSV file. Loading it every time is slow.
 With `@st.cache_data`, you only load it once unless the file path changes.
 """)
 
-@st.cache_data
-def load_data(csv_path):
-    st.write("Loading data from CSV...")
+# Once the TTL expires the stale dataset keeps being served while a single
+# background refresh pays for the download (and the simulated delay).
+# The CSV is parsed once into a local Parquet file; later reads are columnar.
+@profiler.timed
+@swr_cache(ttl=600)
+def load_data(content):
     time.sleep(2)  # Simulate slow file loading
-    return pd.read_csv(csv_path)
+    return csv_to_parquet(content, source="hw_200.csv")
+
+@observed_cache_data(max_entries=32)
+def read_columns(dataset, columns=None, filters=None):
+    return read_dataset(dataset, columns=columns, filters=filters)
 
 # For demonstration, use a sample CSV from the web
 csv_url = "https://people.sc.fsu.edu/~jburkardt/data/csv/hw_200.csv"
 st.write(f"Loading data from: {csv_url}")
+if csv_url not in load_data.cache.entries:
+    st.write("Loading data from CSV...")
 
-df = load_data(csv_url)
-st.dataframe(df.head())
+dataset = load_data(csv_url)
+df = read_columns(dataset)
+columns = st.multiselect("Columns to load", dataset_schema(dataset).names, key="day20_columns")
+st.dataframe(read_columns(dataset, columns=columns or None).head())
 
 st.info("Try re-running the app. The data loads instantly from cache unless the URL changes.")
 
+with st.expander("Query with SQL"):
+    sql_query_panel(
+        {"hw_200": dataset},
+        'SELECT ROUND("Height(Inches)") AS height, COUNT(*) AS people, AVG("Weight(Pounds)") AS avg_weight\n'
+        'FROM hw_200 GROUP BY 1 ORDER BY 1',
+        key="day20_sql"
+    )
+
 st.markdown("---")  # End of Day 20
 
 import streamlit.components.v1 as components
 
+profiler.section("Day 21")
 st.header("Day 21: Using Streamlit Components")
 
 st.write("""
@@ -58,31 +86,56 @@ st.subheader("Community Component Example")
 st.write("Try installing and using components from https://streamlit.io/components for more functionality!")
 
 # Example: Use streamlit-aggrid (if installed)
-try:
+@st.cache_resource(max_entries=4)
+def get_row_server(df):
+    return RowServer(df)
+
+st_aggrid = optional_import("st_aggrid", page="module6")
+if st_aggrid is None:
+    st.warning("Install `st-aggrid` to see an interactive grid table: `pip install streamlit-aggrid`")
+else:
     st.write("Below is an interactive AgGrid table (requires `st-aggrid`):")
-    gb = GridOptionsBuilder.from_dataframe(df)
-    gb.configure_pagination()
+    # Sorting, filtering and paging run on the server; only the visible
+    # page of rows is sent to the grid.
+    row_server = get_row_server(df)
+    col1, col2, col3 = st.columns(3)
+    sort_by = col1.selectbox("Sort by", ["(none)"] + list(df.columns), key="grid_sort")
+    descending = col2.checkbox("Descending", key="grid_desc")
+    page_size = col3.selectbox("Rows per page", [25, 50, 100], key="grid_page_size")
+    filter_col, filter_text = st.columns(2)
+    filter_column = filter_col.selectbox("Filter column", list(df.columns), key="grid_filter_col")
+    filter_label = "Equals" if row_server.is_numeric(filter_column) else "Contains"
+    filter_value = filter_text.text_input(filter_label, key="grid_filter_value")
+    filters = {filter_column: filter_value} if filter_value else None
+    sort = None if sort_by == "(none)" else sort_by
+    _, total = row_server.block(0, 0, sort=sort, ascending=not descending, filters=filters)
+    num_pages = max(1, -(-total // page_size))
+    page = st.number_input("Page", min_value=1, max_value=num_pages, value=1, key="grid_page")
+    start = (page - 1) * page_size
+    window, total = row_server.block(start, start + page_size, sort=sort, ascending=not descending, filters=filters)
+    gb = st_aggrid.GridOptionsBuilder.from_dataframe(window)
     gb.configure_side_bar()
     gridOptions = gb.build()
-    AgGrid(df, gridOptions=gridOptions, height=200)
-except ImportError:
-    st.warning("Install `st-aggrid` to see an interactive grid table: `pip install streamlit-aggrid`")
+    st_aggrid.AgGrid(window, gridOptions=gridOptions, height=200)
+    st.caption(f"Rows {min(start + 1, total)}-{start + len(window)} of {total:,}")
 
 # Example: Use streamlit-tags (if installed)
-try:
+streamlit_tags = optional_import("streamlit_tags", page="module6")
+if streamlit_tags is None:
+    st.warning("Install `streamlit-tags` to use the tag input widget: `pip install streamlit-tags`")
+else:
     st.write("Below is a tag input widget (requires `streamlit-tags`):")
-    tags = st_tags(
+    tags = streamlit_tags.st_tags(
         label='Enter tags:',
         text='Press enter to add more',
         value=['Streamlit', 'Component'],
     )
     st.write("Tags:", tags)
-except ImportError:
-    st.warning("Install `streamlit-tags` to use the tag input widget: `pip install streamlit-tags`")
 
 st.markdown("---")  # End of Day 21
 
 
+profiler.section("Day 22")
 st.header("Day 22: Animations and Lottie Files")
 
 st.write("""
@@ -101,10 +154,16 @@ st.markdown("---")
 try:
     from streamlit_lottie import st_lottie
     import requests
+    from utils.http import get_client
 
     st.subheader("Lottie Animation Example")
+    @profiler.timed
+    @st.cache_data(ttl=3600)
     def load_lottieurl(url):
-        r = requests.get(url)
+        try:
+            r = get_client().get(url)
+        except requests.RequestException:
+            return None
         if r.status_code != 200:
             return None
         return r.json()
@@ -120,6 +179,7 @@ except ImportError:
 
 st.markdown("---")  # End of Day 22
 
+profiler.section("Day 23")
 st.header("Day 23: Error Handling & Debugging")
 
 st.write("""
@@ -146,6 +206,7 @@ st.markdown("""
 
 st.markdown("---")  # End of Day 23
 
+profiler.section("Day 24")
 st.header("Day 24: Performance Optimization")
 
 st.write("""
@@ -160,14 +221,17 @@ Here are some tips:
 # Example: Compare cached vs. non-cached data loading
 st.subheader("Cached vs. Non-Cached Data Loading")
 
-@st.cache_data
+@profiler.timed
+@observed_cache_data()
+@persistent_memo()
 def load_data_cached(n):
     time.sleep(2)
-    return pd.DataFrame(np.random.randn(n, 3), columns=["A", "B", "C"])
+    return generate("tabular", n, seed=24, columns=["A", "B", "C"])
 
+@profiler.timed
 def load_data_uncached(n):
     time.sleep(2)
-    return pd.DataFrame(np.random.randn(n, 3), columns=["A", "B", "C"])
+    return generate("tabular", n, seed=24, columns=["A", "B", "C"])
 
 rows = st.slider("Number of rows", 1000, 10000, 5000, step=1000)
 
@@ -183,4 +247,14 @@ with col2:
 
 st.info("Try changing the slider and observe the loading time difference between cached and non-cached functions.")
 
-st.markdown("---")  # End of Day 24
\ No newline at end of file
+# Hit/miss counts, compute time and entry sizes for every cached function
+with st.expander("Cache diagnostics"):
+    cache_diagnostics()
+
+st.markdown("---")  # End of Day 24
+
+import_profile_panel("module6")
+
+leak_panel("module6")
+
+profiler.finish()
@@ -1,9 +1,17 @@
 import streamlit as st
 import requests
 import pandas as pd
+from utils.api_batch import MAX_CONCURRENCY, fetch_users, fetch_users_sequential, prefetch_images
+from utils.export import FORMATS, available_formats, export_bytes
+from utils.http import get_client
+from utils.submissions import get_store
+from utils.leaks import leak_panel
+from utils.profiling import PageProfiler
 
+profiler = PageProfiler("module7")
 st.title("Module 7: Integration & Deployment")
 
+profiler.section("Day 25")
 # Day 25: API Integration
 st.header("Day 25: API Integration")
 st.write("""
@@ -11,16 +19,41 @@ You can fetch and display data from APIs in Streamlit using Python's `requests`
 Below is an example that fetches random user data from a public API.
 """)
 if st.button("Fetch Random User"):
-    response = requests.get("https://randomuser.me/api/")
-    if response.status_code == 200:
+    try:
+        response = get_client().get("https://randomuser.me/api/")
+    except requests.RequestException:
+        response = None
+    if response is not None and response.status_code == 200:
         user = response.json()["results"][0]
         st.write("Name:", user["name"]["first"], user["name"]["last"])
         st.write("Email:", user["email"])
         st.image(user["picture"]["large"])
     else:
         st.error("Failed to fetch data from API.")
+st.subheader("Batch Fetch")
+with st.form("batch_fetch_form"):
+    batch_size = st.number_input("Number of users", min_value=1, max_value=500, value=50)
+    # Capped at the shared client's connections per host; more would only queue.
+    concurrency = st.slider("Concurrent requests", 1, MAX_CONCURRENCY, MAX_CONCURRENCY)
+    compare_sequential = st.checkbox("Also time a sequential fetch")
+    fetch_batch = st.form_submit_button("Fetch Users")
+if fetch_batch:
+    users_df, errors, elapsed = fetch_users(batch_size, concurrency=concurrency)
+    users_df["Thumbnail"] = prefetch_images(users_df["Thumbnail"], concurrency=concurrency)
+    st.dataframe(users_df, column_config={"Thumbnail": st.column_config.ImageColumn()})
+    if errors:
+        st.warning(f"{len(errors)} of {batch_size} requests failed.")
+    st.write(f"Concurrent fetch: {elapsed:.2f} s")
+    if compare_sequential:
+        _, sequential_errors, sequential_elapsed = fetch_users_sequential(batch_size)
+        if sequential_errors:
+            st.warning(f"{len(sequential_errors)} of {batch_size} sequential requests failed.")
+        st.write(f"Sequential fetch: {sequential_elapsed:.2f} s ({sequential_elapsed / elapsed:.1f}x slower)")
+with st.expander("HTTP client stats"):
+    st.write(get_client().stats())
 st.markdown("---")
 
+profiler.section("Day 26")
 # Day 26: Authentication Basics
 st.header("Day 26: Authentication Basics")
 st.write("""
@@ -32,26 +65,38 @@ with st.form("auth_form"):
     password = st.text_input("Password", type="password")
     login = st.form_submit_button("Login")
 if login:
-    if username == "user" and password == "streamlit":
+    success = username == "user" and password == "streamlit"
+    # Never store the password, only the outcome.
+    get_store().submit("auth_form", {"username": username, "success": success})
+    if success:
         st.success("Login successful!")
     else:
         st.error("Invalid credentials.")
 st.markdown("---")
 
+profiler.section("Day 27")
 # Day 27: File Downloads
 st.header("Day 27: File Downloads")
 st.write("""
 You can let users download data or files using `st.download_button`.
 """)
 sample_df = pd.DataFrame({"A": [1, 2, 3], "B": [4, 5, 6]})
-st.download_button(
-    label="Download sample CSV",
-    data=sample_df.to_csv(index=False),
-    file_name="sample.csv",
-    mime="text/csv"
-)
+# The file is only serialised after "Prepare download" is clicked,
+# and the bytes are cached per DataFrame and format.
+export_format = st.selectbox("Download format", available_formats())
+if st.button("Prepare download"):
+    st.session_state.export_format = export_format
+if st.session_state.get("export_format") == export_format:
+    extension, mime = FORMATS[export_format]
+    st.download_button(
+        label=f"Download sample {export_format}",
+        data=export_bytes(sample_df, export_format),
+        file_name=f"sample.{extension}",
+        mime=mime
+    )
 st.markdown("---")
 
+profiler.section("Day 28")
 # Day 28: Deploying to Streamlit Cloud
 st.header("Day 28: Deploying to Streamlit Cloud")
 st.write("""
@@ -63,3 +108,7 @@ You can deploy your Streamlit app for free using [Streamlit Community Cloud](htt
 st.info("Check the [Streamlit Cloud documentation](https://docs.streamlit.io/streamlit-community-cloud) for more details.")
 
 st.markdown("---")  # End of Module 7
+
+leak_panel("module7")
+
+profiler.finish()
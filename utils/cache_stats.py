@@ -0,0 +1,142 @@
+"""Hit/miss and size telemetry for cached functions.
+
+``observed_cache_data(**kwargs)`` is a drop-in replacement for
+``st.cache_data(**kwargs)`` that records, per function, hits, misses, compute
+time, result size, distinct argument keys and evictions (a miss for a key
+that was computed before, i.e. dropped by ``max_entries``/``ttl``).
+``cache_diagnostics()`` renders the numbers so cache limits can be sized from
+data.
+"""
+import functools
+import threading
+import time
+
+import pandas as pd
+import streamlit as st
+
+from utils.session_memory import deep_sizeof
+
+_stats = {}
+_stats_lock = threading.Lock()
+
+
+class CacheStats:
+    def __init__(self, name, max_entries=None, ttl=None):
+        self.name = name
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.hit_seconds = 0.0
+        self.compute_seconds = 0.0
+        self.entry_bytes = {}
+        self._lock = threading.Lock()
+
+    def record_hit(self, seconds):
+        with self._lock:
+            self.hits += 1
+            self.hit_seconds += seconds
+
+    def record_miss(self, key, seconds, value):
+        nbytes = deep_sizeof(value)
+        with self._lock:
+            self.misses += 1
+            self.compute_seconds += seconds
+            if key in self.entry_bytes:
+                self.evictions += 1
+            self.entry_bytes[key] = nbytes
+
+    def as_dict(self):
+        with self._lock:
+            calls = self.hits + self.misses
+            return {
+                "function": self.name,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / calls, 3) if calls else None,
+                "mean_hit_ms": round(self.hit_seconds / self.hits * 1000, 2) if self.hits else None,
+                "mean_compute_ms": round(self.compute_seconds / self.misses * 1000, 2) if self.misses else None,
+                "distinct_keys": len(self.entry_bytes),
+                "mean_entry_kb": round(sum(self.entry_bytes.values()) / len(self.entry_bytes) / 1024, 1) if self.entry_bytes else None,
+                "evictions": self.evictions,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+            }
+
+
+def register(key, name, **limits):
+    """Return the process-wide ``CacheStats`` for ``key``, creating it once."""
+    with _stats_lock:
+        stats = _stats.get(key)
+        if stats is None:
+            stats = _stats[key] = CacheStats(name, **limits)
+        return stats
+
+
+def _arg_key(args, kwargs):
+    try:
+        return hash((args, tuple(sorted(kwargs.items()))))
+    except TypeError:
+        # Unhashable arguments (e.g. DataFrames): fall back to their repr.
+        return hash(repr((args, sorted(kwargs.items()))))
+
+
+def observed_cache_data(**cache_kwargs):
+    """``st.cache_data`` with hit/miss/size telemetry."""
+    def decorator(fn):
+        key = (fn.__code__.co_filename, fn.__qualname__)
+        stats = register(
+            key, fn.__qualname__,
+            max_entries=cache_kwargs.get("max_entries"),
+            ttl=cache_kwargs.get("ttl"),
+        )
+        computed = threading.local()
+
+        # functools.wraps matters: Streamlit keys the cache on the wrapped
+        # function's module, qualname and source.
+        @functools.wraps(fn)
+        def compute(*args, **kwargs):
+            start = time.perf_counter()
+            value = fn(*args, **kwargs)
+            computed.miss = (time.perf_counter() - start, value)
+            return value
+
+        cached = st.cache_data(**cache_kwargs)(compute)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            computed.miss = None
+            start = time.perf_counter()
+            value = cached(*args, **kwargs)
+            if computed.miss is None:
+                stats.record_hit(time.perf_counter() - start)
+            else:
+                seconds, result = computed.miss
+                computed.miss = None
+                stats.record_miss(_arg_key(args, kwargs), seconds, result)
+            return value
+
+        wrapper.clear = cached.clear
+        wrapper.stats = stats
+        return wrapper
+
+    return decorator
+
+
+def all_stats():
+    with _stats_lock:
+        return [s.as_dict() for s in _stats.values()]
+
+
+def cache_diagnostics():
+    """Table of cache telemetry for every observed function in this process."""
+    rows = all_stats()
+    if not rows:
+        st.write("No cached functions have been called yet.")
+        return
+    st.dataframe(pd.DataFrame(rows), hide_index=True)
+    st.caption(
+        "Evictions count misses for keys that were computed before. "
+        "A high count with many distinct keys suggests raising max_entries or the TTL."
+    )
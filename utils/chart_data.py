@@ -0,0 +1,91 @@
+"""Server-side pre-aggregation for Altair charts.
+
+Altair embeds every row of the DataFrame in the Vega-Lite spec sent to the
+browser. For large frames, run the encoding's binning, time-unit and
+aggregation transforms here with vectorised pandas/NumPy and hand Altair only
+the reduced table. Results are cached per chart spec plus data hash.
+"""
+import hashlib
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAX_CACHED_RESULTS = 64
+
+TIME_UNITS = {
+    "year": lambda s: s.dt.to_period("Y").dt.start_time,
+    "yearmonth": lambda s: s.dt.to_period("M").dt.start_time,
+    "yearmonthdate": lambda s: s.dt.normalize(),
+    "month": lambda s: s.dt.month,
+    "day": lambda s: s.dt.dayofweek,
+    "date": lambda s: s.dt.day,
+    "hours": lambda s: s.dt.hour,
+}
+
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def data_hash(df):
+    """Content hash of a DataFrame, including column names and dtypes."""
+    h = hashlib.sha256()
+    h.update(repr(list(zip(df.columns, df.dtypes.astype(str)))).encode())
+    h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return h.hexdigest()
+
+
+def _bin(values, maxbins):
+    lo, hi = np.nanmin(values), np.nanmax(values)
+    if lo == hi:
+        hi = lo + 1
+    edges = np.linspace(lo, hi, maxbins + 1)
+    idx = np.clip(np.digitize(values, edges) - 1, 0, maxbins - 1)
+    return edges[idx], edges[idx + 1]
+
+
+def _reduce(df, x, y, color, aggregate, maxbins, time_unit):
+    work = pd.DataFrame(index=df.index)
+    keys = [x]
+    if maxbins:
+        work[x], work[f"{x}_end"] = _bin(df[x].to_numpy(dtype="float64"), maxbins)
+        keys.append(f"{x}_end")
+    elif time_unit:
+        work[x] = TIME_UNITS[time_unit](pd.to_datetime(df[x]))
+    else:
+        work[x] = df[x]
+    if color:
+        work[color] = df[color]
+        keys.append(color)
+    if aggregate == "count":
+        reduced = work.groupby(keys, sort=False, observed=True).size().rename(y or "count")
+    else:
+        work[y] = df[y]
+        reduced = work.groupby(keys, sort=False, observed=True)[y].agg(aggregate)
+    return reduced.reset_index()
+
+
+def aggregate_for_chart(df, x, y=None, color=None, aggregate="sum", maxbins=None, time_unit=None):
+    """Reduce ``df`` to one row per (x[, color]) group as the chart would.
+
+    ``maxbins`` bins a numeric ``x`` into ``x``/``x_end`` columns (use
+    ``alt.X(x, bin="binned")`` and ``x2=x_end``), ``time_unit`` applies a
+    Vega-Lite-style time unit such as ``"yearmonth"``, and ``aggregate`` is any
+    pandas aggregation name or ``"count"``.
+    """
+    if time_unit and time_unit not in TIME_UNITS:
+        raise ValueError(f"Unsupported time unit: {time_unit!r}")
+    spec = (x, y, color, aggregate, maxbins, time_unit)
+    key = (spec, data_hash(df))
+    with _results_lock:
+        reduced = _results.get(key)
+        if reduced is not None:
+            _results.move_to_end(key)
+            return reduced
+    reduced = _reduce(df, x, y, color, aggregate, maxbins, time_unit)
+    with _results_lock:
+        _results[key] = reduced
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+    return reduced
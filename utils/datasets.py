@@ -0,0 +1,152 @@
+"""Columnar local cache for CSV datasets.
+
+A source CSV is parsed once (in bounded chunks, with dtypes inferred from a
+sample) and stored as Parquet under ``data/datasets``, named after the source
+and the SHA-256 of its content (or a caller-supplied id such as an upload's
+``file_id``). Spaces after delimiters are skipped and column names are
+stripped, so ``a, "b"`` headers become ``a`` and ``b``. Later reads load only
+the requested columns and skip row groups whose statistics cannot match the
+filters.
+
+Set ``DATASET_DIR`` to store datasets elsewhere. The directory is capped at ``DATASET_MAX_BYTES`` and ``DATASET_MAX_AGE``
+seconds since last use; the least recently used datasets are deleted first.
+"""
+import hashlib
+import io
+import os
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.ingest import infer_dtypes
+
+DATASET_DIR = Path(os.environ.get("DATASET_DIR") or Path(__file__).resolve().parent.parent / "data" / "datasets")
+ROW_GROUP_ROWS = 128_000
+DATASET_MAX_BYTES = int(os.environ.get("DATASET_MAX_BYTES", 2 * 1024**3))
+DATASET_MAX_AGE = int(os.environ.get("DATASET_MAX_AGE", 7 * 24 * 3600))
+# Part of every key, so datasets written by an older conversion are not reused.
+FORMAT_VERSION = "2"
+
+
+def dataset_path(key):
+    return DATASET_DIR / f"{key}.parquet"
+
+
+def _touch(path):
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+
+def prune_datasets(keep=None):
+    """Delete datasets unused for ``DATASET_MAX_AGE`` or beyond ``DATASET_MAX_BYTES``."""
+    now = time.time()
+    entries = []
+    for path in DATASET_DIR.glob("*"):
+        try:
+            info = path.stat()
+        except FileNotFoundError:
+            continue
+        if path.suffix == ".tmp":
+            # Left behind by a converter that crashed.
+            if now - info.st_mtime > 3600:
+                path.unlink(missing_ok=True)
+        elif path.stem != keep:
+            entries.append((info.st_mtime, info.st_size, path))
+    total = sum(size for _, size, _ in entries)
+    for mtime, size, path in sorted(entries):
+        if now - mtime > DATASET_MAX_AGE or total > DATASET_MAX_BYTES:
+            path.unlink(missing_ok=True)
+            total -= size
+
+
+def _slug(source):
+    name = Path(str(source).split("?", 1)[0]).stem if source else "dataset"
+    return re.sub(r"[^A-Za-z0-9_-]+", "_", name)[:40] or "dataset"
+
+
+def _clean_columns(frame):
+    frame.columns = [str(c).strip().strip('"').strip() for c in frame.columns]
+    return frame
+
+
+def csv_to_parquet(content, source=None, content_id=None, row_group_rows=ROW_GROUP_ROWS):
+    """Store CSV ``content`` as Parquet once; return its dataset key.
+
+    ``content`` is bytes or a binary file object. A file object is read in
+    chunks from the start and needs ``content_id``, which replaces the
+    content hash in the key.
+    """
+    if content_id is None:
+        content_id = hashlib.sha256(FORMAT_VERSION.encode() + content).hexdigest()[:32]
+    else:
+        content_id = re.sub(r"[^A-Za-z0-9_-]+", "_", f"v{FORMAT_VERSION}-{content_id}")
+    key = f"{_slug(source)}-{content_id}"
+    path = dataset_path(key)
+    if path.exists():
+        _touch(path)
+        return key
+    DATASET_DIR.mkdir(parents=True, exist_ok=True)
+    file = io.BytesIO(content) if isinstance(content, bytes) else content
+    file.seek(0)
+    dtypes, _ = infer_dtypes(file, skipinitialspace=True)
+    # Write to a private temp file and rename, so concurrent converters
+    # never expose a half-written dataset.
+    with tempfile.NamedTemporaryFile(dir=DATASET_DIR, prefix=f"{key}.", suffix=".tmp", delete=False) as f:
+        tmp = Path(f.name)
+    try:
+        try:
+            _write_parquet(file, tmp, dtypes, row_group_rows)
+        except (TypeError, ValueError):
+            # A later chunk does not fit the dtypes inferred from the sample,
+            # so keep every column as text rather than fail the load.
+            _write_parquet(file, tmp, str, row_group_rows)
+        os.replace(tmp, path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    prune_datasets(keep=key)
+    return key
+
+
+def _write_parquet(file, tmp, dtypes, row_group_rows):
+    file.seek(0)
+    writer = None
+    try:
+        with pd.read_csv(file, dtype=dtypes, chunksize=row_group_rows, skipinitialspace=True) as reader:
+            for chunk in reader:
+                table = pa.Table.from_pandas(_clean_columns(chunk), preserve_index=False)
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp, table.schema)
+                writer.write_table(table.cast(writer.schema), row_group_size=row_group_rows)
+        if writer is None:
+            # Header-only CSV: keep the columns.
+            file.seek(0)
+            header = _clean_columns(pd.read_csv(file, skipinitialspace=True))
+            pq.write_table(pa.Table.from_pandas(header, preserve_index=False), tmp)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def read_dataset(key, columns=None, filters=None):
+    """Load a cached dataset as a DataFrame.
+
+    ``columns`` limits which columns are read from disk. ``filters`` uses
+    pyarrow's DNF format, e.g. ``[("Height(Inches)", ">", 70)]``; row groups
+    whose min/max statistics rule out a match are never read.
+    """
+    path = dataset_path(key)
+    _touch(path)
+    table = pq.read_table(path, columns=columns, filters=filters or None, memory_map=True)
+    return table.to_pandas()
+
+
+def dataset_schema(key):
+    """Column names and types without reading any data pages."""
+    return pq.read_schema(dataset_path(key))
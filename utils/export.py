@@ -0,0 +1,137 @@
+"""Lazy, chunked DataFrame export in several formats.
+
+Payloads are only built when a user asks for them, are serialised in row
+chunks (so compression and columnar writers never need a full text copy of
+the frame), and the resulting bytes are cached per DataFrame hash and format.
+"""
+import io
+import threading
+import zlib
+from collections import OrderedDict
+
+from utils.chart_data import data_hash
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+CHUNK_ROWS = 100_000
+CACHE_BUDGET_BYTES = 128 * 1024 * 1024
+
+# format -> (file extension, MIME type)
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "CSV (gzip)": ("csv.gz", "application/gzip"),
+    "CSV (zstd)": ("csv.zst", "application/zstd"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Arrow IPC": ("arrow", "application/vnd.apache.arrow.file"),
+}
+
+_payloads = OrderedDict()
+_payloads_bytes = 0
+_payloads_lock = threading.Lock()
+
+
+def available_formats():
+    """Formats whose optional dependencies are installed."""
+    formats = ["CSV", "CSV (gzip)"]
+    if zstandard is not None:
+        formats.append("CSV (zstd)")
+    if pa is not None:
+        formats += ["Parquet", "Arrow IPC"]
+    return formats
+
+
+def iter_csv(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, max(len(df), 1), chunk_rows):
+        yield df.iloc[start:start + chunk_rows].to_csv(index=False, header=start == 0).encode()
+
+
+def _iter_compressed(chunks, compressor):
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that can be drained while keeping a running offset.
+
+    Arrow writers record absolute offsets via ``tell()``, so the position must
+    keep counting after the buffered bytes have been handed off.
+    """
+
+    def __init__(self):
+        self.buffer = bytearray()
+        self.position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, b):
+        self.buffer += b
+        self.position += len(b)
+        return len(b)
+
+    def tell(self):
+        return self.position
+
+    def drain(self):
+        data = bytes(self.buffer)
+        self.buffer.clear()
+        return data
+
+
+def _iter_arrow(df, fmt, chunk_rows):
+    sink = _ChunkSink()
+    schema = pa.Schema.from_pandas(df, preserve_index=False)
+    if fmt == "Parquet":
+        writer = pq.ParquetWriter(sink, schema)
+    else:
+        writer = pa.ipc.new_file(sink, schema)
+    with writer:
+        for start in range(0, len(df), chunk_rows):
+            writer.write_table(pa.Table.from_pandas(df.iloc[start:start + chunk_rows], schema=schema, preserve_index=False))
+            yield sink.drain()
+    yield sink.drain()
+
+
+def iter_export(df, fmt, chunk_rows=CHUNK_ROWS):
+    """Yield the serialised ``df`` in ``fmt`` as a stream of byte chunks."""
+    if fmt not in available_formats():
+        raise ValueError(f"Export format {fmt!r} is not available")
+    if fmt == "CSV":
+        return iter_csv(df, chunk_rows)
+    if fmt == "CSV (gzip)":
+        return _iter_compressed(iter_csv(df, chunk_rows), zlib.compressobj(wbits=31))
+    if fmt == "CSV (zstd)":
+        return _iter_compressed(iter_csv(df, chunk_rows), zstandard.ZstdCompressor().compressobj())
+    return _iter_arrow(df, fmt, chunk_rows)
+
+
+def export_bytes(df, fmt):
+    """Serialised ``df`` in ``fmt``, cached per (data hash, format)."""
+    global _payloads_bytes
+    key = (data_hash(df), fmt)
+    with _payloads_lock:
+        payload = _payloads.get(key)
+        if payload is not None:
+            _payloads.move_to_end(key)
+            return payload
+    payload = b"".join(iter_export(df, fmt))
+    with _payloads_lock:
+        if key not in _payloads and len(payload) <= CACHE_BUDGET_BYTES:
+            _payloads[key] = payload
+            _payloads_bytes += len(payload)
+            while _payloads_bytes > CACHE_BUDGET_BYTES:
+                _, old = _payloads.popitem(last=False)
+                _payloads_bytes -= len(old)
+    return payload
@@ -0,0 +1,140 @@
+"""Rendered-figure cache for Matplotlib plots.
+
+Figures are drawn on a standalone ``matplotlib.figure.Figure`` (never
+registered with pyplot, so nothing accumulates across reruns), rendered to
+PNG/SVG bytes and kept in a byte-budgeted LRU keyed on a hash of the drawing
+function, its inputs and the style. A repeat rerun is a dictionary lookup.
+
+The function's hash covers its code, the values it closes over and the
+module globals it reads, so a closure drawing a different series (or a
+changed module-level constant) gets its own entry.
+"""
+import hashlib
+import io
+import threading
+import types
+from collections import OrderedDict
+
+import numpy as np
+
+DEFAULT_BUDGET_BYTES = 32 * 1024 * 1024
+
+
+def _update_digest(h, obj):
+    if isinstance(obj, np.ndarray):
+        h.update(f"ndarray{obj.dtype}{obj.shape}".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}{len(obj)}".encode())
+        for item in obj:
+            _update_digest(h, item)
+    elif isinstance(obj, types.FunctionType):
+        # Helpers called from the drawing function; their own state is not followed.
+        h.update(f"function{obj.__module__}.{obj.__qualname__}".encode())
+        _update_digest(h, obj.__code__)
+    elif isinstance(obj, types.ModuleType):
+        h.update(f"module{obj.__name__}".encode())
+    elif isinstance(obj, types.CodeType):
+        # Nested functions and comprehensions: their repr holds an address.
+        h.update(obj.co_code)
+        _update_digest(h, obj.co_consts)
+    elif isinstance(obj, dict):
+        h.update(f"dict{len(obj)}".encode())
+        for key in sorted(obj, key=repr):
+            _update_digest(h, key)
+            _update_digest(h, obj[key])
+    else:
+        h.update(repr(obj).encode())
+
+
+def _global_names(code):
+    names = set(code.co_names)
+    for const in code.co_consts:
+        if isinstance(const, types.CodeType):
+            names |= _global_names(const)
+    return names
+
+
+def function_state(fn):
+    """Closure cell contents and referenced module globals of ``fn``."""
+    cells = tuple(cell.cell_contents for cell in fn.__closure__ or ())
+    names = _global_names(fn.__code__) & fn.__globals__.keys()
+    return cells, {name: fn.__globals__[name] for name in names}
+
+
+def figure_key(draw, args, kwargs, style, fmt, dpi, figsize):
+    h = hashlib.sha256()
+    # co_consts covers the literals (labels, titles, colours) in the function.
+    _update_digest(h, (draw.__code__.co_filename, draw.__qualname__, draw.__code__))
+    _update_digest(h, function_state(draw))
+    _update_digest(h, (args, kwargs, style, fmt, dpi, figsize))
+    return h.hexdigest()
+
+
+class FigureCache:
+    """Thread-safe LRU of rendered figure bytes bounded by total size."""
+
+    def __init__(self, budget_bytes=DEFAULT_BUDGET_BYTES):
+        self.budget_bytes = budget_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            data = self._items.get(key)
+            if data is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return data
+
+    def put(self, key, data):
+        with self._lock:
+            if key in self._items:
+                self.total_bytes -= len(self._items.pop(key))
+            if len(data) > self.budget_bytes:
+                return
+            self._items[key] = data
+            self.total_bytes += len(data)
+            while self.total_bytes > self.budget_bytes:
+                _, old = self._items.popitem(last=False)
+                self.total_bytes -= len(old)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+
+
+figure_cache = FigureCache()
+
+
+def render_figure(draw, *args, fmt="png", style=None, dpi=100, figsize=None, **kwargs):
+    """Return ``draw(ax, *args, **kwargs)`` rendered as ``fmt`` bytes, cached.
+
+    ``style`` is anything ``matplotlib.style.context`` accepts (a style name or
+    a dict of rcParams) and is part of the cache key.
+    """
+    key = figure_key(draw, args, kwargs, style, fmt, dpi, figsize)
+    data = figure_cache.get(key)
+    if data is not None:
+        return data
+    # Imported here so cache hits never pay for loading Matplotlib.
+    import matplotlib.style
+    from matplotlib.figure import Figure
+
+    with matplotlib.style.context(style or {}):
+        fig = Figure(figsize=figsize, dpi=dpi)
+        try:
+            draw(fig.add_subplot(), *args, **kwargs)
+            buf = io.BytesIO()
+            fig.savefig(buf, format=fmt, bbox_inches="tight")
+        finally:
+            fig.clear()
+    data = buf.getvalue()
+    figure_cache.put(key, data)
+    return data
@@ -0,0 +1,136 @@
+"""Shared, pooled HTTP client for all outbound requests.
+
+One ``requests.Session`` per process with keep-alive connection pooling,
+a per-host connection limit, default timeouts, retry with exponential backoff
+and a cap on response size. ``stats()`` exposes request latency and how many
+requests reused an existing connection.
+"""
+import threading
+import time
+from collections import deque
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+DEFAULT_TIMEOUT = (5, 30)  # (connect, read) seconds
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+DEFAULT_POOL_SIZE = 10
+CHUNK_SIZE = 64 * 1024
+
+
+class ResponseTooLarge(requests.RequestException):
+    pass
+
+
+class HTTPClient:
+    """Thin wrapper over a pooled ``requests.Session`` with instrumentation."""
+
+    def __init__(self, timeout=DEFAULT_TIMEOUT, max_bytes=DEFAULT_MAX_BYTES,
+                 per_host_connections=DEFAULT_POOL_SIZE, retries=3, backoff_factor=0.5):
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.per_host_connections = per_host_connections
+        self.session = requests.Session()
+        retry = Retry(
+            total=retries,
+            backoff_factor=backoff_factor,
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=("GET", "HEAD"),
+            raise_on_status=False,
+        )
+        # pool_block makes callers wait for a free connection instead of
+        # opening more than per_host_connections to one host.
+        self.adapter = HTTPAdapter(
+            pool_connections=DEFAULT_POOL_SIZE,
+            pool_maxsize=per_host_connections,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session.mount("http://", self.adapter)
+        self.session.mount("https://", self.adapter)
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=1000)
+        self.requests = 0
+        self.errors = 0
+        self.bytes_received = 0
+
+    def request(self, method, url, max_bytes=None, timeout=None, **kwargs):
+        """Send a request and read at most ``max_bytes`` of the body."""
+        max_bytes = self.max_bytes if max_bytes is None else max_bytes
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, stream=True, timeout=timeout or self.timeout, **kwargs)
+            try:
+                declared = response.headers.get("Content-Length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise ResponseTooLarge(f"{url} declares {declared} bytes (limit {max_bytes})")
+                body = bytearray()
+                for chunk in response.iter_content(CHUNK_SIZE):
+                    body += chunk
+                    if len(body) > max_bytes:
+                        raise ResponseTooLarge(f"{url} exceeded {max_bytes} bytes")
+                response._content = bytes(body)
+            finally:
+                # Returns the connection to the pool.
+                response.close()
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.requests += 1
+                self._latencies.append(time.perf_counter() - start)
+        with self._lock:
+            self.bytes_received += len(response._content)
+        return response
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def connection_counts(self):
+        """(connections opened, requests sent) summed over all host pools."""
+        # Only the container's public mapping interface is used, so a urllib3
+        # upgrade cannot break stats().
+        pools = self.adapter.poolmanager.pools
+        values = []
+        for key in pools.keys():
+            try:
+                values.append(pools[key])
+            except KeyError:
+                continue  # evicted since keys() was taken
+        opened = sum(getattr(p, "num_connections", 0) for p in values)
+        sent = sum(getattr(p, "num_requests", 0) for p in values)
+        return opened, sent
+
+    def stats(self):
+        opened, sent = self.connection_counts()
+        with self._lock:
+            latencies = np.asarray(self._latencies) * 1000
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "bytes_received": self.bytes_received,
+                "connections_opened": opened,
+                "connections_reused": max(0, sent - opened),
+                "latency_mean_ms": round(float(latencies.mean()), 2) if len(latencies) else None,
+                "latency_p95_ms": round(float(np.percentile(latencies, 95)), 2) if len(latencies) else None,
+            }
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    """The process-wide ``HTTPClient``."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = HTTPClient()
+        return _client
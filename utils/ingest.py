@@ -0,0 +1,154 @@
+"""Chunked, memory-bounded CSV ingestion for large uploads."""
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.session_memory import load
+
+SAMPLE_ROWS = 1000
+PREVIEW_ROWS = 100
+DEFAULT_MEMORY_LIMIT_MB = 256
+
+
+def infer_dtypes(file, sample_rows=SAMPLE_ROWS, **read_kwargs):
+    """Read a small sample and return (dtypes, sample) for the full parse."""
+    sample = pd.read_csv(file, nrows=sample_rows, **read_kwargs)
+    file.seek(0)
+    dtypes = {}
+    for col, dtype in sample.dtypes.items():
+        if pd.api.types.is_integer_dtype(dtype):
+            # Later chunks may contain gaps, so use a nullable integer type.
+            dtypes[col] = "Int64"
+        elif pd.api.types.is_float_dtype(dtype):
+            dtypes[col] = "float64"
+        elif pd.api.types.is_bool_dtype(dtype):
+            dtypes[col] = "boolean"
+        else:
+            dtypes[col] = "string"
+    return dtypes, sample
+
+
+def chunk_rows(sample, memory_limit_mb):
+    """Number of rows per chunk so that one parsed chunk fits the ceiling."""
+    bytes_per_row = max(1, int(sample.memory_usage(deep=True).sum() / max(len(sample), 1)))
+    # pandas needs roughly twice the final frame size while parsing a chunk.
+    return max(1000, int(memory_limit_mb * 1024 * 1024 / (2 * bytes_per_row)))
+
+
+# Dtype to fall back to when a later chunk does not fit the inferred one.
+WIDER_DTYPE = {"Int64": "float64", "float64": "string", "boolean": "string"}
+
+
+def _coerce(chunk, dtypes):
+    """Cast ``chunk`` to ``dtypes``, widening (and remembering) any that do not fit."""
+    for col, dtype in dtypes.items():
+        if col not in chunk:
+            continue
+        while True:
+            try:
+                chunk[col] = chunk[col].astype(dtype)
+                break
+            except (TypeError, ValueError):
+                dtype = dtypes[col] = WIDER_DTYPE.get(dtype, "string")
+    return chunk
+
+
+def iter_csv_chunks(file, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+    """Yield DataFrame chunks of ``file`` without loading it all in memory.
+
+    Dtypes come from the first rows. A later chunk that does not fit them
+    (e.g. a float in an integer column) widens that column to float or text
+    from then on instead of failing halfway through the file.
+    """
+    dtypes, sample = infer_dtypes(file)
+    # Only text columns are forced while parsing; the rest are cast per chunk.
+    forced = {col: dtype for col, dtype in dtypes.items() if dtype == "string"}
+    reader = pd.read_csv(file, dtype=forced, chunksize=chunk_rows(sample, memory_limit_mb))
+    with reader:
+        for chunk in reader:
+            yield _coerce(chunk, dtypes)
+
+
+class RunningStats:
+    """Per-column count/mean/std/min/max merged chunk by chunk."""
+
+    def __init__(self):
+        self.rows = 0
+        self.count = {}
+        self.mean = {}
+        self.m2 = {}
+        self.min = {}
+        self.max = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+        for col in chunk.select_dtypes(include="number").columns:
+            values = chunk[col].dropna().to_numpy(dtype="float64")
+            if not len(values):
+                continue
+            n_b = len(values)
+            mean_b = values.mean()
+            m2_b = ((values - mean_b) ** 2).sum()
+            n_a = self.count.get(col, 0)
+            mean_a = self.mean.get(col, 0.0)
+            n = n_a + n_b
+            delta = mean_b - mean_a
+            # Chan et al. parallel update of the running mean and variance.
+            self.mean[col] = mean_a + delta * n_b / n
+            self.m2[col] = self.m2.get(col, 0.0) + m2_b + delta ** 2 * n_a * n_b / n
+            self.count[col] = n
+            self.min[col] = min(self.min.get(col, np.inf), values.min())
+            self.max[col] = max(self.max.get(col, -np.inf), values.max())
+
+    def to_frame(self):
+        cols = list(self.count)
+        return pd.DataFrame({
+            "count": [self.count[c] for c in cols],
+            "mean": [self.mean[c] for c in cols],
+            "std": [np.sqrt(self.m2[c] / (self.count[c] - 1)) if self.count[c] > 1 else np.nan for c in cols],
+            "min": [self.min[c] for c in cols],
+            "max": [self.max[c] for c in cols],
+        }, index=cols)
+
+
+def render_csv_stream(file, memory_limit_mb=DEFAULT_MEMORY_LIMIT_MB):
+    """Stream ``file`` into the page: preview after the first chunk, live stats after each.
+
+    The result is kept in session state per uploaded file, so later reruns of
+    the page show it without parsing the file again.
+    """
+    file_id = getattr(file, "file_id", None)
+    state_key = f"_csv_stream_{file_id}"
+    if file_id is not None and state_key in st.session_state:
+        try:
+            # May have been spilled to disk by the session memory policy.
+            head, stats, chunks = load(state_key)
+        except KeyError:
+            pass
+        else:
+            st.dataframe(head)
+            st.write(f"Rows read: {stats.rows:,} ({chunks} chunks)")
+            st.dataframe(stats.to_frame())
+            return stats
+
+    preview = st.empty()
+    status = st.empty()
+    summary = st.empty()
+    stats = RunningStats()
+    head = None
+    chunks = 0
+    try:
+        for chunks, chunk in enumerate(iter_csv_chunks(file, memory_limit_mb), start=1):
+            if head is None:
+                head = chunk.head(PREVIEW_ROWS)
+                preview.dataframe(head)
+            stats.update(chunk)
+            status.write(f"Rows read: {stats.rows:,} ({chunks} chunks)")
+            summary.dataframe(stats.to_frame())
+    except (TypeError, ValueError) as e:
+        st.error("Could not parse the CSV.")
+        st.exception(e)
+        return stats
+    if file_id is not None and head is not None:
+        st.session_state[state_key] = (head, stats, chunks)
+    return stats
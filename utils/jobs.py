@@ -0,0 +1,125 @@
+"""Background job runner for long tasks that should not block reruns.
+
+Jobs run in a process-wide thread pool and are keyed to the Streamlit
+session that started them, so they survive reruns. A job reports progress by
+overwriting its latest state; the page polls that state from a fragment on a
+fixed interval, which coalesces updates and rate-limits the deltas sent to
+the browser no matter how often the job reports.
+"""
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+DEFAULT_MAX_WORKERS = 4
+FINISHED_JOB_TTL = 3600  # seconds a finished job stays visible
+
+
+class JobCancelled(Exception):
+    pass
+
+
+@dataclass
+class Job:
+    id: int
+    session_id: str
+    name: str
+    progress: float = 0.0
+    message: str = ""
+    status: str = "queued"  # queued, running, done, failed, cancelled
+    result: Any = None
+    error: Optional[BaseException] = None
+    started_at: float = field(default_factory=time.time)
+    finished_at: Optional[float] = None
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    def report(self, progress, message=""):
+        """Record the latest progress (0-1). Raises if the job was cancelled."""
+        if self._cancel.is_set():
+            raise JobCancelled()
+        self.progress = min(max(progress, 0.0), 1.0)
+        self.message = message
+
+    @property
+    def cancelled(self):
+        return self._cancel.is_set()
+
+    @property
+    def finished(self):
+        return self.status in ("done", "failed", "cancelled")
+
+
+class JobRunner:
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancelled:
+            job.status = "cancelled"
+        else:
+            job.status = "running"
+            try:
+                job.result = fn(job, *args, **kwargs)
+                job.status = "cancelled" if job.cancelled else "done"
+            except JobCancelled:
+                job.status = "cancelled"
+            except Exception as e:
+                job.error = e
+                job.status = "failed"
+        job.finished_at = time.time()
+
+    def submit(self, session_id, name, fn, *args, **kwargs):
+        """Run ``fn(job, *args, **kwargs)`` in the pool and return the ``Job``."""
+        self.prune()
+        job = Job(id=next(self._ids), session_id=session_id, name=name)
+        with self._lock:
+            self._jobs[job.id] = job
+        self._pool.submit(self._run, job, fn, args, kwargs)
+        return job
+
+    def jobs(self, session_id):
+        with self._lock:
+            return [job for job in self._jobs.values() if job.session_id == session_id]
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+        if job is not None:
+            job._cancel.set()
+
+    def dismiss(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is not None and job.finished:
+                del self._jobs[job_id]
+
+    def prune(self, max_age=FINISHED_JOB_TTL):
+        now = time.time()
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.finished and now - j.finished_at > max_age]:
+                del self._jobs[job_id]
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_runner():
+    """The process-wide ``JobRunner``."""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner()
+        return _runner
+
+
+def current_session_id():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else "no-session"
@@ -0,0 +1,97 @@
+"""Deferred imports for heavy or optional libraries, with an import profile.
+
+``lazy_import("pandas")`` returns a stand-in module that performs the real
+import the first time an attribute is used, so a page only pays for a library
+once the section that needs it runs. ``optional_import`` returns ``None``
+when a component is not installed so the page can degrade cleanly. The first
+import of each module per page is timed and recorded for
+``import_profile()``; pages re-import on every rerun, so later calls are not
+recorded again.
+"""
+import importlib
+import sys
+import threading
+import time
+import types
+
+_records = {}
+_records_lock = threading.Lock()
+
+
+def _timed_import(name, page):
+    already_loaded = name in sys.modules
+    start = time.perf_counter()
+    try:
+        module = importlib.import_module(name)
+    finally:
+        with _records_lock:
+            _records.setdefault((page, name), {
+                "page": page,
+                "module": name,
+                "seconds": time.perf_counter() - start,
+                "cached": already_loaded,
+                "imported_at": time.time(),
+            })
+    return module
+
+
+class LazyModule(types.ModuleType):
+    """Module stand-in that imports the real module on first attribute access."""
+
+    def __init__(self, name, page=None):
+        super().__init__(name)
+        self.__dict__["_lazy_page"] = page
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            module = _timed_import(self.__name__, self.__dict__["_lazy_page"])
+            self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        state = "loaded" if self.__dict__["_lazy_module"] is not None else "not loaded"
+        return f"<lazy module {self.__name__!r} ({state})>"
+
+
+def lazy_import(name, page=None):
+    """Return a ``LazyModule`` for ``name`` (attributes trigger the import)."""
+    return LazyModule(name, page)
+
+
+def optional_import(name, page=None):
+    """Import ``name`` now, or return None if it is not installed."""
+    try:
+        return _timed_import(name, page)
+    except ImportError:
+        return None
+
+
+def import_profile():
+    """Recorded imports as a list of dicts, slowest first."""
+    with _records_lock:
+        return sorted(_records.values(), key=lambda r: r["seconds"], reverse=True)
+
+
+def import_profile_panel(page):
+    """Sidebar expander listing the imports recorded for ``page``."""
+    import streamlit as st
+
+    records = [r for r in import_profile() if r["page"] == page]
+    with st.sidebar.expander("Import profile"):
+        if not records:
+            st.write("No deferred imports have run on this page yet.")
+            return
+        st.dataframe(
+            [{"module": r["module"], "ms": round(r["seconds"] * 1000, 1), "cached": r["cached"]} for r in records],
+            hide_index=True,
+        )
+        first_loads = sum(r["seconds"] for r in records if not r["cached"])
+        st.caption(f"First-load import cost: {first_loads * 1000:,.0f} ms")
@@ -0,0 +1,187 @@
+"""Resource leak detection across reruns.
+
+After each rerun a ``Sample`` records traced Python memory per allocation
+site (tracemalloc), open file descriptors and live Matplotlib figures. An
+allocation site is reported as leaking when its total grew in most
+rerun-to-rerun intervals and by more than ``min_growth`` bytes overall, so
+one-off growth such as caches filling up is not flagged. Warm-up reruns
+(first imports, cold caches) are excluded.
+
+``leak_panel(page)`` adds a sidebar report to a running page. Tracing is
+process-wide and slows every session, so the panel only appears when the
+server was started with ``LEAK_TRACKING=1``. ``detect_leaks(run, reruns)``
+drives reruns itself and is what ``python -m benchmarks.run --leaks N`` uses.
+"""
+import gc
+import os
+import sys
+import threading
+import tracemalloc
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+import streamlit as st
+
+TRACE_FRAMES = 5
+WARMUP_RERUNS = 3
+MAX_SAMPLES = 50
+MIN_GROWTH = 64 * 1024
+
+_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    # The retained samples themselves would otherwise be the top "leak".
+    tracemalloc.Filter(False, __file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    tracemalloc.Filter(False, "<unknown>"),
+]
+
+_samples = {}
+_reruns_seen = {}
+_samples_lock = threading.Lock()
+
+
+@dataclass
+class Sample:
+    sites: dict
+    traced: int
+    open_fds: Optional[int]
+    figures: int
+    pyplot_figures: int
+
+
+def open_fds():
+    """Number of file descriptors open in this process, if the OS exposes it."""
+    for path in ("/proc/self/fd", "/dev/fd"):
+        try:
+            return len(os.listdir(path))
+        except OSError:
+            continue
+    return None
+
+
+def live_figures():
+    """Matplotlib ``Figure`` objects still alive after a collection."""
+    figure = sys.modules.get("matplotlib.figure")
+    if figure is None:
+        return 0
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, figure.Figure))
+
+
+def pyplot_figures():
+    """Figures still registered with pyplot, i.e. never ``plt.close``d."""
+    pyplot = sys.modules.get("matplotlib.pyplot")
+    return len(pyplot.get_fignums()) if pyplot is not None else 0
+
+
+def take_sample():
+    gc.collect()
+    snapshot = tracemalloc.take_snapshot().filter_traces(_FILTERS)
+    sites = {}
+    for stat in snapshot.statistics("lineno"):
+        frame = stat.traceback[0]
+        sites[f"{frame.filename}:{frame.lineno}"] = stat.size
+    return Sample(sites, sum(sites.values()), open_fds(), live_figures(), pyplot_figures())
+
+
+def growing_sites(samples, min_growth=MIN_GROWTH, min_ratio=0.8, limit=20):
+    """Sites whose size grew in at least ``min_ratio`` of the intervals."""
+    intervals = len(samples) - 1
+    if intervals < 2:
+        return []
+    first, last = samples[0].sites, samples[-1].sites
+    rows = []
+    for site, size in last.items():
+        growth = size - first.get(site, 0)
+        if growth < min_growth:
+            continue
+        grew = sum(1 for a, b in zip(samples, samples[1:]) if b.sites.get(site, 0) > a.sites.get(site, 0))
+        if grew / intervals >= min_ratio:
+            rows.append({
+                "site": site,
+                "growth_kb": round(growth / 1024, 1),
+                "per_rerun_b": round(growth / intervals),
+                "grew_in": f"{grew}/{intervals}",
+            })
+    rows.sort(key=lambda r: r["growth_kb"], reverse=True)
+    return rows[:limit]
+
+
+def leak_report(samples, **kwargs):
+    """Start/end resource counts and steadily growing sites for ``samples``."""
+    first, last = samples[0], samples[-1]
+    return {
+        "reruns": len(samples) - 1,
+        "traced_mb": [round(first.traced / 2**20, 2), round(last.traced / 2**20, 2)],
+        "open_fds": [first.open_fds, last.open_fds],
+        "figures": [first.figures, last.figures],
+        "pyplot_figures": [first.pyplot_figures, last.pyplot_figures],
+        "growing_sites": growing_sites(samples, **kwargs),
+    }
+
+
+def detect_leaks(run, reruns=20, warmup=WARMUP_RERUNS, **kwargs):
+    """Call ``run()`` ``warmup + reruns`` times, sampling after each rerun."""
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start(TRACE_FRAMES)
+    try:
+        for _ in range(warmup):
+            run()
+        samples = [take_sample()]
+        for _ in range(reruns):
+            run()
+            samples.append(take_sample())
+    finally:
+        if started:
+            tracemalloc.stop()
+    return leak_report(samples, **kwargs)
+
+
+def leak_tracking_enabled():
+    return os.environ.get("LEAK_TRACKING", "") not in ("", "0")
+
+
+def leak_panel(page):
+    """Sidebar report of what grows across reruns of ``page``.
+
+    Only shown when ``LEAK_TRACKING`` is set. Samples are process-wide, so
+    reruns from other sessions count too.
+    """
+    if not leak_tracking_enabled() or not st.sidebar.checkbox("Track leaks", key="track_leaks"):
+        return
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACE_FRAMES)
+    with _samples_lock:
+        # The first reruns after tracing starts only fill caches; skip them.
+        seen = _reruns_seen[page] = _reruns_seen.get(page, 0) + 1
+        samples = _samples.setdefault(page, deque(maxlen=MAX_SAMPLES))
+        if seen > WARMUP_RERUNS:
+            samples.append(take_sample())
+        samples = list(samples)
+
+    with st.sidebar.expander("Leak report", expanded=True):
+        if len(samples) < 3:
+            st.write("Rerun the page a few more times to collect samples.")
+        else:
+            report = leak_report(samples)
+            st.caption(
+                f"Over {report['reruns']} reruns: traced memory {report['traced_mb'][0]} → "
+                f"{report['traced_mb'][1]} MB, open files {report['open_fds'][0]} → {report['open_fds'][1]}, "
+                f"figures {report['figures'][0]} → {report['figures'][1]} "
+                f"(pyplot {report['pyplot_figures'][0]} → {report['pyplot_figures'][1]})"
+            )
+            if report["growing_sites"]:
+                st.dataframe(report["growing_sites"], hide_index=True)
+            else:
+                st.write("No allocation site grew steadily.")
+        st.button("Stop tracking", key="stop_leak_tracking", on_click=_stop_tracking)
+
+
+def _stop_tracking():
+    with _samples_lock:
+        _samples.clear()
+        _reruns_seen.clear()
+    tracemalloc.stop()
+    st.session_state["track_leaks"] = False
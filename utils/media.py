@@ -0,0 +1,215 @@
+"""Range-request media server for files in ``media/``.
+
+Streamlit copies any file object passed to ``st.audio``/``st.video`` into the
+server's memory for every session. Instead, files are served from a small
+side server that memory-maps them once and answers HTTP Range requests, so
+players fetch only the bytes they need and memory stays flat per file.
+
+Configure with environment variables:
+- ``MEDIA_SERVER_HOST`` / ``MEDIA_SERVER_PORT``: where the side server binds
+  (default ``127.0.0.1:8765``).
+- ``MEDIA_BASE_URL``: public URL the browser uses to reach it, e.g. a path
+  proxied by the same HTTPS front end as the app. Required for remote
+  browsers: without it the side server is only used when the page is opened
+  on the server's own machine (``localhost``).
+
+Whenever the side server cannot be used (not configured for a remote
+browser, or it failed to start) ``media_source`` falls back to the file's
+bytes, which Streamlit serves itself.
+"""
+import mimetypes
+import mmap
+import os
+import re
+import logging
+import threading
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import streamlit as st
+
+MEDIA_DIR = Path(__file__).resolve().parent.parent / "media"
+MAX_OPEN_FILES = 16
+CHUNK_SIZE = 256 * 1024
+RANGE_RE = re.compile(r"bytes=(\d*)-(\d*)$")
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "::1"}
+
+logger = logging.getLogger(__name__)
+
+
+class MappedFilePool:
+    """Bounded LRU pool of memory-mapped files shared by all sessions."""
+
+    def __init__(self, max_open=MAX_OPEN_FILES):
+        self.max_open = max_open
+        self._files = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get(self, path):
+        entry = self._files.get(path)
+        if entry is None:
+            f = open(path, "rb")
+            try:
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # Empty files cannot be mapped.
+                mm = b""
+            entry = self._files[path] = (f, mm)
+            while len(self._files) > self.max_open:
+                _, (old_f, old_mm) = self._files.popitem(last=False)
+                if isinstance(old_mm, mmap.mmap):
+                    old_mm.close()
+                old_f.close()
+        self._files.move_to_end(path)
+        return entry[1]
+
+    def size(self, path):
+        with self._lock:
+            return len(self._get(path))
+
+    def read(self, path, start, end):
+        """Return bytes ``start..end`` inclusive. Copies only that slice."""
+        with self._lock:
+            return self._get(path)[start:end + 1]
+
+    def close(self):
+        with self._lock:
+            for f, mm in self._files.values():
+                if isinstance(mm, mmap.mmap):
+                    mm.close()
+                f.close()
+            self._files.clear()
+
+
+def parse_range(header, size):
+    """Return (start, end) for a single ``bytes=`` range, or None if unsatisfiable."""
+    match = RANGE_RE.match(header.strip())
+    if not match or size == 0:
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    elif last:
+        # Suffix range: the final N bytes.
+        start = max(0, size - int(last))
+        end = size - 1
+    else:
+        return None
+    if start > end or start >= size:
+        return None
+    return start, end
+
+
+def make_handler(pool, media_dir=MEDIA_DIR):
+    media_dir = Path(media_dir).resolve()
+
+    class MediaHandler(BaseHTTPRequestHandler):
+        def log_message(self, format, *args):
+            pass
+
+        def _resolve(self):
+            name = self.path.split("?", 1)[0].lstrip("/")
+            path = (media_dir / name).resolve()
+            if media_dir not in path.parents or not path.is_file():
+                return None
+            return path
+
+        def _send(self, body):
+            path = self._resolve()
+            if path is None:
+                self.send_error(404)
+                return
+            size = pool.size(path)
+            start, end, status = 0, size - 1, 200
+            range_header = self.headers.get("Range")
+            if range_header:
+                byte_range = parse_range(range_header, size)
+                if byte_range is None:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.end_headers()
+                    return
+                (start, end), status = byte_range, 206
+            self.send_response(status)
+            self.send_header("Content-Type", mimetypes.guess_type(path.name)[0] or "application/octet-stream")
+            self.send_header("Accept-Ranges", "bytes")
+            self.send_header("Content-Length", str(max(0, end - start + 1)))
+            self.send_header("Cache-Control", "public, max-age=3600")
+            if status == 206:
+                self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.end_headers()
+            if not body:
+                return
+            pos = start
+            while pos <= end:
+                chunk_end = min(end, pos + CHUNK_SIZE - 1)
+                self.wfile.write(pool.read(path, pos, chunk_end))
+                pos = chunk_end + 1
+
+        def do_HEAD(self):
+            self._send(body=False)
+
+        def do_GET(self):
+            try:
+                self._send(body=True)
+            except (BrokenPipeError, ConnectionResetError):
+                # Players routinely abort a range once they have enough data.
+                pass
+
+    return MediaHandler
+
+
+@st.cache_resource
+def get_media_server():
+    """Start the process-wide media server once; return its base URL or None."""
+    host = os.environ.get("MEDIA_SERVER_HOST", "127.0.0.1")
+    port = int(os.environ.get("MEDIA_SERVER_PORT", "8765"))
+    base_url = os.environ.get("MEDIA_BASE_URL")
+    # A proxy points at a fixed port; otherwise any free port will do, e.g.
+    # when another app on this host already holds the default one.
+    ports = [port] if base_url or port == 0 else [port, 0]
+    for candidate in ports:
+        try:
+            server = ThreadingHTTPServer((host, candidate), make_handler(MappedFilePool()))
+            break
+        except OSError as e:
+            logger.warning("Media server could not bind %s:%s: %s", host, candidate, e)
+    else:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="media-server", daemon=True).start()
+    return (base_url or f"http://{host}:{server.server_address[1]}").rstrip("/")
+
+
+def _browser_is_local():
+    """Whether this session's page was opened via a loopback host name."""
+    try:
+        host = st.context.headers.get("Host", "")
+    except Exception:
+        return False
+    hostname = host.rsplit(":", 1)[0] if not host.startswith("[") else host[1:].split("]", 1)[0]
+    return hostname in LOCAL_HOSTS
+
+
+def media_url(name):
+    """Side-server URL for ``media/<name>``, or None if it cannot be used."""
+    if not (MEDIA_DIR / name).is_file():
+        return None
+    if not os.environ.get("MEDIA_BASE_URL") and not _browser_is_local():
+        return None
+    base_url = get_media_server()
+    return f"{base_url}/{name}" if base_url else None
+
+
+def media_source(name):
+    """What to pass to ``st.audio``/``st.video`` for ``media/<name>``.
+
+    The side-server URL when it is usable, otherwise the file's bytes; None
+    when the file does not exist.
+    """
+    path = MEDIA_DIR / name
+    if not path.is_file():
+        return None
+    return media_url(name) or path.read_bytes()
@@ -0,0 +1,203 @@
+"""Persistent, cross-process memoization for expensive pure functions.
+
+Results are pickled into a SQLite database under ``data/`` (WAL mode, so
+many worker processes can read while one writes). Keys are SHA-256 digests of
+the function's qualified name, its source code and a canonical encoding of
+the arguments, so they are stable across interpreter runs and change when the
+function body changes. A per-key file lock stops two processes from
+computing the same value at once, and the store evicts least recently used
+entries once it grows past ``max_bytes``. Set ``MEMO_DB_PATH`` to use a
+different database (the benchmarks use a throwaway one).
+"""
+import contextlib
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to SQLite's own locking only.
+    fcntl = None
+
+DB_PATH = Path(os.environ.get("MEMO_DB_PATH") or Path(__file__).resolve().parent.parent / "data" / "memo.db")
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+TOUCH_INTERVAL = 60  # seconds between LRU timestamp updates for one key
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS memo (
+    key TEXT PRIMARY KEY,
+    function TEXT NOT NULL,
+    value BLOB NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS memo_accessed ON memo (accessed_at);
+"""
+
+
+def _encode(h, obj):
+    """Feed a canonical, interpreter-independent encoding of ``obj`` to ``h``."""
+    if obj is None or isinstance(obj, (bool, int, float, complex, str, bytes)):
+        h.update(f"{type(obj).__name__}:{obj!r};".encode())
+    elif isinstance(obj, (list, tuple)):
+        h.update(f"{type(obj).__name__}[{len(obj)}]".encode())
+        for item in obj:
+            _encode(h, item)
+    elif isinstance(obj, dict):
+        h.update(f"dict[{len(obj)}]".encode())
+        for key in sorted(obj, key=repr):
+            _encode(h, key)
+            _encode(h, obj[key])
+    elif isinstance(obj, (set, frozenset)):
+        h.update(f"set[{len(obj)}]".encode())
+        for item in sorted(obj, key=repr):
+            _encode(h, item)
+    elif isinstance(obj, np.generic):
+        _encode(h, obj.item())
+    elif isinstance(obj, np.ndarray):
+        h.update(f"ndarray:{obj.dtype.str}:{obj.shape};".encode())
+        h.update(np.ascontiguousarray(obj).tobytes())
+    elif isinstance(obj, (pd.DataFrame, pd.Series)):
+        h.update(f"{type(obj).__name__}:{list(getattr(obj, 'columns', [obj.name]))};".encode())
+        h.update(pd.util.hash_pandas_object(obj, index=True).to_numpy().tobytes())
+    else:
+        raise TypeError(f"Cannot build a stable memo key for {type(obj).__name__}")
+
+
+def memo_key(fn, args, kwargs):
+    h = hashlib.sha256()
+    h.update(fn.__qualname__.encode())
+    try:
+        h.update(inspect.getsource(fn).encode())
+    except (OSError, TypeError):
+        pass
+    bound = inspect.signature(fn).bind(*args, **kwargs)
+    bound.apply_defaults()
+    _encode(h, dict(bound.arguments))
+    return h.hexdigest()
+
+
+class MemoStore:
+    def __init__(self, path=DB_PATH, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.lock_dir = self.path.parent / f"{self.path.name}.locks"
+        self.lock_dir.mkdir(exist_ok=True)
+        self.max_bytes = max_bytes
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    @contextlib.contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    @contextlib.contextmanager
+    def key_lock(self, key):
+        """Exclusive cross-process lock for computing ``key``."""
+        if fcntl is None:
+            yield
+            return
+        with open(self.lock_dir / key[:16], "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def get(self, key):
+        """Return (found, value)."""
+        now = time.time()
+        with self._connect() as conn:
+            row = conn.execute("SELECT value, accessed_at FROM memo WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return False, None
+            if now - row[1] > TOUCH_INTERVAL:
+                conn.execute("UPDATE memo SET accessed_at = ? WHERE key = ?", (now, key))
+        return True, pickle.loads(row[0])
+
+    def put(self, key, function, value):
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO memo (key, function, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, function, blob, len(blob), now, now),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn):
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM memo").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in conn.execute("SELECT key, size FROM memo ORDER BY accessed_at").fetchall():
+            conn.execute("DELETE FROM memo WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self):
+        with self._connect() as conn:
+            return conn.execute(
+                "SELECT function, COUNT(*), SUM(size) FROM memo GROUP BY function"
+            ).fetchall()
+
+    def clear(self, function=None):
+        with self._connect() as conn:
+            if function is None:
+                conn.execute("DELETE FROM memo")
+            else:
+                conn.execute("DELETE FROM memo WHERE function = ?", (function,))
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_store(path=DB_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    with _stores_lock:
+        store = _stores.get(str(path))
+        if store is None:
+            store = _stores[str(path)] = MemoStore(path, max_bytes)
+        store.max_bytes = max_bytes
+        return store
+
+
+def persistent_memo(path=DB_PATH, max_bytes=DEFAULT_MAX_BYTES):
+    """Memoize a pure function on disk, shared by every process on the host."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            store = get_store(path, max_bytes)
+            key = memo_key(fn, args, kwargs)
+            found, value = store.get(key)
+            if found:
+                return value
+            with store.key_lock(key):
+                # Another process may have finished while we waited.
+                found, value = store.get(key)
+                if found:
+                    return value
+                value = fn(*args, **kwargs)
+                store.put(key, fn.__qualname__, value)
+            return value
+
+        return wrapper
+
+    return decorator
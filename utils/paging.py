@@ -0,0 +1,84 @@
+"""Server-side row model for large tables.
+
+``st_aggrid`` serialises every row it is given, so instead of handing it the
+full frame the page asks a ``RowServer`` for one block of rows at a time.
+Sort orders and filter masks are computed once per frame and cached, so
+paging through a sorted, filtered view only slices precomputed positions.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+MAX_CACHED_VIEWS = 32
+
+
+class RowServer:
+    """Answers (filter, sort, block) requests from an indexed copy of a frame."""
+
+    def __init__(self, df):
+        self.df = df.reset_index(drop=True)
+        self._orders = {}
+        self._views = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.df)
+
+    def is_numeric(self, column):
+        return pd.api.types.is_numeric_dtype(self.df[column])
+
+    def _order(self, column, ascending):
+        key = (column, ascending)
+        order = self._orders.get(key)
+        if order is None:
+            order = self.df[column].sort_values(ascending=ascending, kind="stable").index.to_numpy()
+            self._orders[key] = order
+        return order
+
+    def _mask(self, filters):
+        mask = np.ones(len(self.df), dtype=bool)
+        for column, value in filters:
+            series = self.df[column]
+            if isinstance(value, tuple):
+                low, high = value
+                mask &= series.between(low, high).to_numpy()
+            elif pd.api.types.is_numeric_dtype(series):
+                # Text-box input arrives as a string; anything that is not a
+                # number matches no rows.
+                number = pd.to_numeric(value, errors="coerce")
+                if pd.isna(number):
+                    mask[:] = False
+                else:
+                    mask &= (series == number).fillna(False).to_numpy(dtype=bool)
+            else:
+                mask &= series.astype(str).str.contains(str(value), case=False, regex=False).to_numpy()
+        return mask
+
+    def _positions(self, sort, ascending, filters):
+        """Row positions of the filtered, sorted view, cached per view."""
+        key = (sort, ascending, filters)
+        with self._lock:
+            positions = self._views.get(key)
+            if positions is not None:
+                self._views.move_to_end(key)
+                return positions
+            order = self._order(sort, ascending) if sort else np.arange(len(self.df))
+            if filters:
+                order = order[self._mask(filters)[order]]
+            self._views[key] = order
+            while len(self._views) > MAX_CACHED_VIEWS:
+                self._views.popitem(last=False)
+            return order
+
+    def block(self, start, end, sort=None, ascending=True, filters=None):
+        """Return (rows ``start:end`` of the view, total rows in the view).
+
+        ``filters`` maps column to either a ``(low, high)`` range, an exact
+        value for numeric columns (numbers or numeric strings) or a
+        case-insensitive substring for other columns.
+        """
+        filters = tuple(sorted((filters or {}).items()))
+        positions = self._positions(sort, ascending, filters)
+        return self.df.iloc[positions[start:end]], len(positions)
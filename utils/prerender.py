@@ -0,0 +1,152 @@
+"""Pre-rendering of input-independent charts into static assets.
+
+Charts whose inputs are constants are rendered once (at build time via
+``python -m utils.prerender``, or by the first session after a deploy) into
+``static/prerendered`` and served by Streamlit's static file handler
+(``server.enableStaticServing`` in ``.streamlit/config.toml``). Asset names
+include a hash of the drawing code and inputs, so editing either produces a
+fresh asset instead of serving a stale one.
+
+Running this module also scans each page and lists which "Day" sections use
+no widgets or session state and are therefore candidates for pre-rendering.
+"""
+import argparse
+import ast
+import hashlib
+import json
+import threading
+from pathlib import Path
+
+from utils.figures import _update_digest, function_state, render_figure
+
+ROOT = Path(__file__).resolve().parent.parent
+STATIC_DIR = ROOT / "static" / "prerendered"
+STATIC_URL = "app/static/prerendered"
+
+WIDGETS = {
+    "button", "checkbox", "color_picker", "data_editor", "date_input", "download_button",
+    "file_uploader", "form_submit_button", "multiselect", "number_input", "radio",
+    "select_slider", "selectbox", "slider", "text_area", "text_input", "time_input", "toggle",
+}
+
+_assets = {}
+_assets_lock = threading.Lock()
+
+
+def _asset_key(fn, args):
+    h = hashlib.sha256()
+    _update_digest(h, (fn.__qualname__, fn.__code__, function_state(fn), args))
+    return h.hexdigest()[:16]
+
+
+def _write_asset(name, filename, data):
+    STATIC_DIR.mkdir(parents=True, exist_ok=True)
+    for old in STATIC_DIR.glob(f"{name}-*"):
+        if old.name != filename:
+            old.unlink(missing_ok=True)
+    path = STATIC_DIR / filename
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(data)
+    tmp.replace(path)
+
+
+def static_figure(name, draw, *args, fmt="png"):
+    """URL of ``draw(ax, *args)`` pre-rendered to ``static/prerendered``.
+
+    Streamlit's static handler serves only a fixed set of extensions with
+    their real content type (``.png`` and ``.jpg`` but not ``.svg``), so
+    keep ``fmt`` to one of those.
+    """
+    filename = f"{name}-{_asset_key(draw, args)}.{fmt}"
+    with _assets_lock:
+        if filename in _assets:
+            return _assets[filename]
+    if not (STATIC_DIR / filename).exists():
+        _write_asset(name, filename, render_figure(draw, *args, fmt=fmt))
+    url = f"{STATIC_URL}/{filename}"
+    with _assets_lock:
+        _assets[filename] = url
+    return url
+
+
+def static_vega_spec(name, build_chart, *args):
+    """Vega-Lite spec (dict) of ``build_chart(*args)``, built once and kept on disk."""
+    filename = f"{name}-{_asset_key(build_chart, args)}.vl.json"
+    with _assets_lock:
+        if filename in _assets:
+            return _assets[filename]
+    path = STATIC_DIR / filename
+    if path.exists():
+        spec = json.loads(path.read_text())
+    else:
+        spec = build_chart(*args).to_dict()
+        _write_asset(name, filename, json.dumps(spec).encode())
+    with _assets_lock:
+        _assets[filename] = spec
+    return spec
+
+
+def _section_name(stmt):
+    """Name if ``stmt`` is a ``profiler.section("...")`` call."""
+    if isinstance(stmt, ast.Expr) and isinstance(stmt.value, ast.Call):
+        func = stmt.value.func
+        if isinstance(func, ast.Attribute) and func.attr == "section" and stmt.value.args:
+            arg = stmt.value.args[0]
+            if isinstance(arg, ast.Constant):
+                return arg.value
+    return None
+
+
+def _is_interactive(nodes):
+    for node in nodes:
+        for child in ast.walk(node):
+            if isinstance(child, ast.Attribute) and child.attr in WIDGETS | {"session_state"}:
+                return True
+    return False
+
+
+def find_static_sections(path):
+    """[(section, is_static)] for a page script split by ``profiler.section``."""
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    sections, current, body = [], None, []
+    for stmt in tree.body:
+        name = _section_name(stmt)
+        if name is not None:
+            if current is not None:
+                sections.append((current, not _is_interactive(body)))
+            current, body = name, []
+        elif current is not None:
+            body.append(stmt)
+    if current is not None:
+        sections.append((current, not _is_interactive(body)))
+    return sections
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-render static page content.")
+    parser.add_argument("--scan-only", action="store_true", help="Only report static sections")
+    args = parser.parse_args(argv)
+
+    pages = [ROOT / "app.py"] + sorted((ROOT / "pages").glob("*.py"))
+    for page in pages:
+        print(page.relative_to(ROOT))
+        for section, is_static in find_static_sections(page):
+            print(f"  {section:28} {'static' if is_static else 'interactive'}")
+    if args.scan_only:
+        return
+
+    # Running each page once renders every static asset it declares.
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.stubs import stub_network
+
+    with stub_network():
+        for page in pages:
+            AppTest.from_file(str(page), default_timeout=120).run()
+    print(f"Assets in {STATIC_DIR.relative_to(ROOT)}:")
+    for asset in sorted(STATIC_DIR.glob("*")):
+        print(f"  {asset.name}")
+
+
+if __name__ == "__main__":
+    main()
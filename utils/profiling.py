@@ -0,0 +1,144 @@
+"""Section-level timing for page scripts.
+
+Pages are long top-to-bottom scripts split into "Day N" sections, so instead
+of wrapping each one in a ``with`` block a page calls ``profiler.section()``
+where a new section starts; the previous one is closed at that point.
+``profiler.timed`` wraps (cached) functions to time every call. ``finish()``
+shows the breakdown for the current rerun if the user opted in from the
+sidebar.
+
+Set ``SECTION_TIMINGS_LOG`` to a file path to also append one JSON record per
+section and call to a JSONL log. Records are written by a background thread,
+so a slow disk never holds up a rerun, and once the file passes
+``SECTION_TIMINGS_MAX_BYTES`` it is rotated to ``<path>.1``.
+"""
+import functools
+import json
+import logging
+import os
+import queue
+import threading
+import time
+import uuid
+from pathlib import Path
+
+import streamlit as st
+
+from utils.jobs import current_session_id
+
+MAX_LOG_BYTES = int(os.environ.get("SECTION_TIMINGS_MAX_BYTES") or 10 * 1024 * 1024)
+MAX_PENDING_RERUNS = 1000  # reruns queued for the writer before records are dropped
+
+logger = logging.getLogger(__name__)
+
+_log_queue = queue.Queue(maxsize=MAX_PENDING_RERUNS)
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def log_path():
+    path = os.environ.get("SECTION_TIMINGS_LOG")
+    return Path(path) if path else None
+
+
+def _append(path, lines, max_bytes=MAX_LOG_BYTES):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:
+        size = 0
+    if size and size + len(lines) > max_bytes:
+        path.replace(path.with_name(path.name + ".1"))
+    with path.open("a") as f:
+        f.write(lines)
+
+
+def _write_loop():
+    while True:
+        path, lines = _log_queue.get()
+        try:
+            _append(path, lines)
+        except OSError:
+            logger.exception("Could not write section timings to %s", path)
+
+
+def _enqueue(path, lines):
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="section-timings-writer", daemon=True)
+            _writer.start()
+    try:
+        _log_queue.put_nowait((path, lines))
+    except queue.Full:
+        pass  # The writer is behind; timings are best-effort.
+
+
+class PageProfiler:
+    """Times the sections and function calls of one rerun of one page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.run_id = uuid.uuid4().hex
+        self.session_id = current_session_id()
+        self.records = []
+        self._section = None
+        self._section_start = None
+        self._page_start = time.perf_counter()
+
+    def _record(self, kind, name, seconds):
+        self.records.append({
+            "ts": time.time(),
+            "page": self.page,
+            "kind": kind,
+            "section": name,
+            "duration_ms": round(seconds * 1000, 3),
+            "session_id": self.session_id,
+            "run_id": self.run_id,
+        })
+
+    def _close_section(self):
+        if self._section is not None:
+            self._record("section", self._section, time.perf_counter() - self._section_start)
+            self._section = None
+
+    def section(self, name):
+        """End the current section (if any) and start timing ``name``."""
+        self._close_section()
+        self._section = name
+        self._section_start = time.perf_counter()
+
+    def timed(self, fn):
+        """Decorator recording the wall time of every call to ``fn``.
+
+        Put it above ``@st.cache_data`` to see cache hits and misses alike.
+        """
+        name = getattr(fn, "__name__", repr(fn))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                self._record("call", name, time.perf_counter() - start)
+
+        return wrapper
+
+    def write_log(self):
+        path = log_path()
+        if path is None or not self.records:
+            return
+        _enqueue(path, "".join(json.dumps(r) + "\n" for r in self.records))
+
+    def finish(self):
+        """Close the last section, log the rerun and render the opt-in panel."""
+        self._close_section()
+        self._record("page", "total", time.perf_counter() - self._page_start)
+        self.write_log()
+        if st.sidebar.checkbox("Show section timings", key="show_section_timings"):
+            with st.sidebar.expander("Section timings (this rerun)", expanded=True):
+                st.dataframe(
+                    [{"kind": r["kind"], "name": r["section"], "ms": r["duration_ms"]} for r in self.records],
+                    hide_index=True,
+                )
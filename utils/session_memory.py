@@ -0,0 +1,268 @@
+"""Per-session ``st.session_state`` memory accounting and spilling.
+
+``measure()`` computes the deep size of every session-state entry and records
+the session total in a process-wide registry that can be exported as
+metrics. ``MemoryPolicy`` caps a session's bytes: when the cap is exceeded,
+the least recently changed entries of at least ``spill_min_bytes`` are
+spilled to disk, and ``load()`` transparently brings them back. Smaller
+entries (counters, widget values, flags) are never touched: they would
+free little and pages expect them to survive.
+
+Totals and spill directories of sessions that have ended are pruned
+periodically: sessions the runtime reports as gone are removed after a short
+grace period (a browser may reconnect), and when the runtime cannot be asked,
+after ``SESSION_TTL`` seconds without activity.
+"""
+import io
+import pickle
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.jobs import current_session_id
+
+LRU_KEY = "_memory_lru"
+SPILL_DIR = Path(tempfile.gettempdir()) / "streamlit-session-spill"
+SESSION_TTL = 3600
+DISCONNECT_GRACE = 300
+PRUNE_INTERVAL = 60
+
+_totals = {}  # session_id -> (bytes, last measured)
+_totals_lock = threading.Lock()
+_last_prune = 0.0
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate bytes held by ``obj`` and everything it references."""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen:
+        return 0
+    seen.add(id(obj))
+    if isinstance(obj, (pd.DataFrame, pd.Series, pd.Index)):
+        usage = obj.memory_usage(deep=True)
+        return int(usage.sum()) if hasattr(usage, "sum") else int(usage)
+    if isinstance(obj, np.ndarray):
+        return sys.getsizeof(obj) + (obj.nbytes if obj.base is None else 0)
+    if isinstance(obj, io.BytesIO):
+        # Includes Streamlit's UploadedFile.
+        return sys.getsizeof(obj) + obj.getbuffer().nbytes
+    size = sys.getsizeof(obj)
+    if isinstance(obj, (str, bytes, bytearray, int, float, bool, type(None))):
+        return size
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    if hasattr(obj, "__dict__"):
+        size += deep_sizeof(vars(obj), seen)
+    return size
+
+
+@dataclass
+class SpilledEntry:
+    """Placeholder left in session state for an entry written to disk."""
+    path: str
+    nbytes: int
+
+
+@dataclass
+class MemoryPolicy:
+    max_session_bytes: Optional[int] = None
+    spill_min_bytes: int = 1024 * 1024  # smaller entries are left in place
+    spill_dir: Path = SPILL_DIR
+    protected_keys: tuple = ()
+
+
+# Cap used by the pages that keep frames and upload results in session state.
+DEFAULT_POLICY = MemoryPolicy(max_session_bytes=50 * 1024 * 1024)
+
+
+def _session_alive(session_id):
+    """True/False from the Streamlit runtime, or None if it cannot tell."""
+    try:
+        from streamlit import runtime
+
+        if runtime.exists():
+            return runtime.get_instance().is_active_session(session_id)
+    except Exception:
+        pass
+    return None
+
+
+def _expired(session_id, idle):
+    alive = _session_alive(session_id)
+    if alive is None:
+        return idle > SESSION_TTL
+    return not alive and idle > DISCONNECT_GRACE
+
+
+def prune_sessions(spill_dir=SPILL_DIR):
+    """Forget totals and delete spill files of sessions that have ended."""
+    now = time.time()
+    with _totals_lock:
+        for session_id, (_, measured_at) in list(_totals.items()):
+            if _expired(session_id, now - measured_at):
+                del _totals[session_id]
+    for path in Path(spill_dir).glob("*"):
+        try:
+            idle = now - path.stat().st_mtime
+        except FileNotFoundError:
+            continue
+        if path.is_dir() and _expired(path.name, idle):
+            shutil.rmtree(path, ignore_errors=True)
+
+
+def _maybe_prune(spill_dir=SPILL_DIR):
+    global _last_prune
+    with _totals_lock:
+        if time.time() - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = time.time()
+    prune_sessions(spill_dir)
+
+
+def _user_keys(state):
+    return [k for k in state.keys() if not str(k).startswith("_memory")]
+
+
+def measure(state=None):
+    """DataFrame of (key, type, bytes) for the session, largest first."""
+    state = st.session_state if state is None else state
+    rows = []
+    for key in _user_keys(state):
+        value = state[key]
+        nbytes = value.nbytes if isinstance(value, SpilledEntry) else deep_sizeof(value)
+        rows.append({
+            "key": str(key),
+            "type": type(value).__name__,
+            "bytes": nbytes,
+            "spilled": isinstance(value, SpilledEntry),
+        })
+    report = pd.DataFrame(rows, columns=["key", "type", "bytes", "spilled"]).sort_values("bytes", ascending=False)
+    with _totals_lock:
+        _totals[current_session_id()] = (int(report.loc[~report["spilled"], "bytes"].sum()), time.time())
+    _maybe_prune()
+    return report
+
+
+def _touch_changed(state):
+    """Update last-used times for entries whose value object changed."""
+    lru = state.setdefault(LRU_KEY, {})
+    now = time.time()
+    for key in _user_keys(state):
+        value_id = id(state[key])
+        if key not in lru or lru[key][1] != value_id:
+            lru[key] = (now, value_id)
+    for key in list(lru):
+        if key not in state:
+            del lru[key]
+    return lru
+
+
+def touch(key, state=None):
+    """Mark ``key`` as recently used (call when reading an entry)."""
+    state = st.session_state if state is None else state
+    lru = state.setdefault(LRU_KEY, {})
+    if key in state:
+        lru[key] = (time.time(), id(state[key]))
+
+
+def load(key, state=None):
+    """Return ``state[key]``, reading it back from disk if it was spilled.
+
+    Raises ``KeyError`` if the key is missing or its spill file was pruned.
+    """
+    state = st.session_state if state is None else state
+    value = state[key]
+    if isinstance(value, SpilledEntry):
+        path = Path(value.path)
+        try:
+            with path.open("rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            del state[key]
+            raise KeyError(key) from None
+        path.unlink(missing_ok=True)
+        state[key] = value
+    touch(key, state)
+    return value
+
+
+def enforce(policy, state=None):
+    """Spill least recently used large entries until under the cap.
+
+    Returns the list of (key, action) pairs taken.
+    """
+    state = st.session_state if state is None else state
+    lru = _touch_changed(state)
+    if policy.max_session_bytes is None:
+        return []
+    report = measure(state).set_index("key")
+    total = int(report.loc[~report["spilled"], "bytes"].sum())
+    actions = []
+    for key in sorted(lru, key=lambda k: lru[k][0]):
+        if total <= policy.max_session_bytes:
+            break
+        if key in policy.protected_keys or str(key) not in report.index or report.at[str(key), "spilled"]:
+            continue
+        nbytes = int(report.at[str(key), "bytes"])
+        if nbytes < policy.spill_min_bytes:
+            continue
+        try:
+            spill_dir = Path(policy.spill_dir) / current_session_id()
+            spill_dir.mkdir(parents=True, exist_ok=True)
+            path = spill_dir / f"{abs(hash(key))}.pkl"
+            with path.open("wb") as f:
+                pickle.dump(state[key], f, protocol=pickle.HIGHEST_PROTOCOL)
+            state[key] = SpilledEntry(str(path), nbytes)
+            actions.append((key, "spilled"))
+        except Exception:
+            # Widget-bound keys cannot be modified once the widget exists.
+            continue
+        total -= nbytes
+    measure(state)
+    return actions
+
+
+def session_totals():
+    """{session_id: bytes} for every measured session in this process."""
+    with _totals_lock:
+        return {session_id: nbytes for session_id, (nbytes, _) in _totals.items()}
+
+
+def metrics_text():
+    """Session memory in Prometheus text exposition format."""
+    lines = [
+        "# HELP streamlit_session_state_bytes Deep size of st.session_state per session.",
+        "# TYPE streamlit_session_state_bytes gauge",
+    ]
+    lines += [f'streamlit_session_state_bytes{{session="{sid}"}} {nbytes}' for sid, nbytes in session_totals().items()]
+    return "\n".join(lines) + "\n"
+
+
+def session_memory_panel(policy=None):
+    """Sidebar panel with this session's state sizes and the process metrics."""
+    actions = enforce(policy) if policy is not None else []
+    report = measure()
+    with st.sidebar.expander("Session memory"):
+        st.metric("This session", f"{report.loc[~report['spilled'], 'bytes'].sum() / 1024:,.1f} KB")
+        st.dataframe(report, hide_index=True)
+        for key, action in actions:
+            st.caption(f"{key}: {action}")
+        st.write(f"Sessions tracked: {len(session_totals())}")
+        st.download_button(
+            "Export metrics",
+            data=metrics_text(),
+            file_name="session_memory.prom",
+            mime="text/plain"
+        )
@@ -0,0 +1,107 @@
+"""Embedded SQL queries over cached datasets, backed by DuckDB.
+
+Datasets from ``utils.datasets`` are exposed to each query as Arrow datasets
+over their Parquet files, so DuckDB scans them out-of-core and in parallel
+instead of pandas materialising the full frame. Results are cached per SQL
+text plus the content-hash key of every table the query can see.
+
+The database is opened with external access disabled, so queries can only
+read the tables they are given, not arbitrary files or URLs.
+"""
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+
+import pyarrow as pa
+import pyarrow.dataset as ds
+
+from utils.datasets import dataset_path
+
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+MEMORY_LIMIT = os.environ.get("SQL_MEMORY_LIMIT", "1GB")
+MAX_CACHED_RESULTS = 64
+MAX_RESULT_ROWS = 100_000
+
+_connection = None
+_connection_lock = threading.Lock()
+_results = OrderedDict()
+_results_lock = threading.Lock()
+
+
+def available():
+    return duckdb is not None
+
+
+def get_connection():
+    """The process-wide DuckDB database; each query uses its own cursor."""
+    global _connection
+    with _connection_lock:
+        if _connection is None:
+            connection = duckdb.connect(config={
+                "threads": os.cpu_count() or 1,
+                "memory_limit": MEMORY_LIMIT,
+                # Spill large joins/aggregations to disk instead of failing.
+                "temp_directory": os.path.join(tempfile.gettempdir(), "streamlit-duckdb"),
+            })
+            # DuckDB refuses temp_directory in the same config as
+            # enable_external_access=false, so lock down once it is set.
+            connection.execute("SET enable_external_access = false")
+            _connection = connection
+        return _connection
+
+
+def run_query(sql, tables, max_rows=MAX_RESULT_ROWS):
+    """Run ``sql`` with ``tables`` ({name: dataset key}) and return a DataFrame.
+
+    At most ``max_rows`` rows are returned. Results are cached per
+    (normalised SQL, tables) so a repeat query costs a dictionary lookup.
+    """
+    sql = sql.strip().rstrip(";")
+    key = (sql, tuple(sorted(tables.items())), max_rows)
+    with _results_lock:
+        result = _results.get(key)
+        if result is not None:
+            _results.move_to_end(key)
+            return result
+    cursor = get_connection().cursor()
+    try:
+        for name, dataset_key in tables.items():
+            cursor.register(name, ds.dataset(dataset_path(dataset_key), format="parquet"))
+        reader = cursor.execute(sql).fetch_record_batch(10_000)
+        batches, rows = [], 0
+        # Stop pulling batches once enough rows are in hand.
+        for batch in reader:
+            batches.append(batch)
+            rows += batch.num_rows
+            if rows >= max_rows:
+                break
+        result = pa.Table.from_batches(batches, schema=reader.schema).slice(0, max_rows).to_pandas()
+    finally:
+        cursor.close()
+    with _results_lock:
+        _results[key] = result
+        while len(_results) > MAX_CACHED_RESULTS:
+            _results.popitem(last=False)
+    return result
+
+
+def sql_query_panel(tables, default_sql, key):
+    """Text area + results table for querying ``tables`` from a page."""
+    import streamlit as st
+
+    if not available():
+        st.info("Install `duckdb` to run SQL queries on this data: `pip install duckdb`")
+        return
+    st.caption("Tables: " + ", ".join(f"`{name}`" for name in tables))
+    sql = st.text_area("SQL query", default_sql, key=key)
+    if sql.strip():
+        try:
+            st.dataframe(run_query(sql, tables))
+        except duckdb.Error as e:
+            st.error("The query failed.")
+            st.exception(e)
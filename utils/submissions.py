@@ -0,0 +1,192 @@
+"""Durable, batched storage for form submissions.
+
+``submit()`` only puts the payload on an in-memory queue. A background writer
+drains the queue in batches into a local SQLite database in WAL mode, and in
+the same transaction updates small aggregate tables (rating histogram, hourly
+counts), so dashboards read precomputed totals instead of scanning rows.
+
+Write failures never stop the writer: a batch that hits a database error
+(busy past the timeout, disk full) is kept and retried with backoff, and a
+batch with a payload that cannot be stored is written row by row so only the
+bad submission is dropped. Both are logged.
+
+Set ``SUBMISSIONS_DB_PATH`` to use a different database (the benchmarks use a
+throwaway one).
+"""
+import atexit
+import contextlib
+import json
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+DB_PATH = Path(
+    os.environ.get("SUBMISSIONS_DB_PATH") or Path(__file__).resolve().parent.parent / "data" / "submissions.db"
+)
+BATCH_SIZE = 200
+FLUSH_INTERVAL = 1.0  # seconds
+RETRY_DELAYS = (1, 2, 5, 10, 30)  # seconds between attempts at a failed batch
+
+logger = logging.getLogger(__name__)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS submissions (
+    id INTEGER PRIMARY KEY,
+    form TEXT NOT NULL,
+    submitted_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS form_hourly (
+    form TEXT NOT NULL,
+    hour INTEGER NOT NULL,
+    submissions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (form, hour)
+);
+CREATE TABLE IF NOT EXISTS rating_histogram (
+    form TEXT NOT NULL,
+    rating INTEGER NOT NULL,
+    submissions INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (form, rating)
+);
+"""
+
+
+def connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    return conn
+
+
+@contextlib.contextmanager
+def session(path):
+    """Short-lived connection that commits on success and is always closed."""
+    conn = connect(path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+class SubmissionStore:
+    def __init__(self, path=DB_PATH, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        self._stop = threading.Event()
+        with session(self.path) as conn:
+            conn.executescript(SCHEMA)
+        self._writer = threading.Thread(target=self._write_loop, name="submission-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def submit(self, form, payload):
+        """Queue one submission. Never touches the database on the caller's thread."""
+        self._queue.put((form, time.time(), payload))
+
+    def _drain(self, block):
+        batch = []
+        try:
+            batch.append(self._queue.get(timeout=self.flush_interval) if block else self._queue.get_nowait())
+            while len(batch) < self.batch_size:
+                batch.append(self._queue.get_nowait())
+        except queue.Empty:
+            pass
+        return batch
+
+    def _write(self, conn, batch):
+        with conn:
+            conn.executemany(
+                "INSERT INTO submissions (form, submitted_at, payload) VALUES (?, ?, ?)",
+                [(form, ts, json.dumps(payload, default=str)) for form, ts, payload in batch],
+            )
+            conn.executemany(
+                "INSERT INTO form_hourly (form, hour, submissions) VALUES (?, ?, 1) "
+                "ON CONFLICT (form, hour) DO UPDATE SET submissions = submissions + 1",
+                [(form, int(ts // 3600)) for form, ts, _ in batch],
+            )
+            conn.executemany(
+                "INSERT INTO rating_histogram (form, rating, submissions) VALUES (?, ?, 1) "
+                "ON CONFLICT (form, rating) DO UPDATE SET submissions = submissions + 1",
+                [(form, int(p["rating"])) for form, _, p in batch if isinstance(p.get("rating"), (int, float))],
+            )
+
+    def _write_rows(self, conn, batch):
+        """Write ``batch`` one submission at a time, dropping those that fail."""
+        for item in batch:
+            try:
+                self._write(conn, [item])
+            except Exception:
+                logger.exception("Dropping submission for form %r", item[0])
+
+    def _write_loop(self):
+        conn = None
+        retry = []
+        failures = 0
+        try:
+            while not self._stop.is_set() or retry or not self._queue.empty():
+                batch = retry or self._drain(block=not self._stop.is_set())
+                retry = []
+                if not batch:
+                    continue
+                try:
+                    if conn is None:
+                        conn = connect(self.path)
+                    self._write(conn, batch)
+                    failures = 0
+                except sqlite3.OperationalError:
+                    failures += 1
+                    if self._stop.is_set() and failures >= len(RETRY_DELAYS):
+                        logger.exception("Dropping %d submissions at shutdown", len(batch))
+                        continue
+                    logger.exception("Writing %d submissions failed; retrying", len(batch))
+                    retry = batch
+                    self._stop.wait(RETRY_DELAYS[min(failures, len(RETRY_DELAYS)) - 1])
+                except Exception as e:
+                    logger.warning("Writing %d submissions failed (%s); writing them one by one", len(batch), e)
+                    self._write_rows(conn, batch)
+        finally:
+            if conn is not None:
+                conn.close()
+
+    def close(self):
+        """Flush queued submissions and stop the writer."""
+        self._stop.set()
+        self._writer.join(timeout=10)
+
+    def rating_histogram(self, form):
+        with session(self.path) as conn:
+            return dict(conn.execute(
+                "SELECT rating, submissions FROM rating_histogram WHERE form = ? ORDER BY rating", (form,)
+            ).fetchall())
+
+    def hourly_counts(self, hours=24):
+        """{form: submissions} over the last ``hours`` hours."""
+        since = int(time.time() // 3600) - hours + 1
+        with session(self.path) as conn:
+            return dict(conn.execute(
+                "SELECT form, SUM(submissions) FROM form_hourly WHERE hour >= ? GROUP BY form", (since,)
+            ).fetchall())
+
+    def pending(self):
+        return self._queue.qsize()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    """The process-wide ``SubmissionStore``."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = SubmissionStore()
+        return _store
@@ -0,0 +1,139 @@
+"""Stale-while-revalidate TTL cache for URL-backed loaders.
+
+Fresh entries are served from memory. Once an entry is older than its TTL
+it is still served immediately while a single background thread revalidates
+it with a conditional GET (``If-None-Match`` / ``If-Modified-Since``), so an
+unchanged file only costs a ``304 Not Modified``.
+"""
+import functools
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from utils.cache_stats import register
+from utils.http import get_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL = 600
+
+
+@dataclass
+class Entry:
+    value: Any
+    fetched_at: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    refreshing: bool = False
+
+
+class SWRCache:
+    """Per-URL cache of parsed responses with background revalidation."""
+
+    def __init__(self, ttl=DEFAULT_TTL, session=None, clock=time.monotonic, stats=None):
+        # ``session`` only needs a ``get(url, headers=...)`` method.
+        self.ttl = ttl
+        self.stats = stats
+        self.session = session or get_client()
+        self.clock = clock
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def _fetch(self, url, parse, entry=None):
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+        response = self.session.get(url, headers=headers)
+        if response.status_code == 304 and entry is not None:
+            return Entry(entry.value, self.clock(), entry.etag, entry.last_modified)
+        response.raise_for_status()
+        return Entry(
+            value=parse(response.content),
+            fetched_at=self.clock(),
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+
+    def _revalidate(self, url, parse, entry):
+        try:
+            new_entry = self._fetch(url, parse, entry)
+        except Exception:
+            logger.exception("Background refresh of %s failed; keeping stale value", url)
+            with self._lock:
+                entry.refreshing = False
+            return
+        with self._lock:
+            self.entries[url] = new_entry
+
+    def get(self, url, parse):
+        """Return the parsed value for ``url``, blocking only on the first load."""
+        start = time.perf_counter()
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is not None:
+                if self.stats is not None:
+                    self.stats.record_hit(time.perf_counter() - start)
+                if self.clock() - entry.fetched_at >= self.ttl and not entry.refreshing:
+                    entry.refreshing = True
+                    threading.Thread(
+                        target=self._revalidate,
+                        args=(url, parse, entry),
+                        name=f"swr-refresh {url}",
+                        daemon=True,
+                    ).start()
+                return entry.value
+        entry = self._fetch(url, parse)
+        if self.stats is not None:
+            self.stats.record_miss(url, time.perf_counter() - start, entry.value)
+        with self._lock:
+            return self.entries.setdefault(url, entry).value
+
+    def is_stale(self, url):
+        entry = self.entries.get(url)
+        return entry is not None and self.clock() - entry.fetched_at >= self.ttl
+
+    def clear(self):
+        with self._lock:
+            self.entries.clear()
+
+
+_caches = {}
+_caches_lock = threading.Lock()
+
+
+def clear_all():
+    """Empty every registered cache (e.g. between benchmark runs)."""
+    with _caches_lock:
+        caches = list(_caches.values())
+    for cache in caches:
+        cache.clear()
+
+
+def swr_cache(ttl=DEFAULT_TTL):
+    """Decorate ``parse(content: bytes)`` so it is called as ``loader(url)``.
+
+    Streamlit re-executes page scripts on every rerun, so caches are kept in a
+    process-wide registry keyed by the function's file and name rather than
+    on the freshly created function object.
+    """
+    def decorator(parse):
+        key = (parse.__code__.co_filename, parse.__qualname__)
+        with _caches_lock:
+            cache = _caches.get(key)
+            if cache is None:
+                cache = _caches[key] = SWRCache(ttl=ttl, stats=register(key, parse.__qualname__, ttl=ttl))
+            cache.ttl = ttl
+
+        @functools.wraps(parse)
+        def loader(url):
+            return cache.get(url, parse)
+
+        loader.cache = cache
+        return loader
+
+    return decorator
@@ -0,0 +1,136 @@
+"""Deterministic, vectorised synthetic datasets.
+
+Every generator is seeded and produces its rows in fixed-size blocks, each
+drawn from its own ``np.random.default_rng((seed, block))`` stream. The
+content therefore depends only on the seed and row count, never on how the
+caller chunks the output, so a 100M-row frame can be streamed or written to
+disk chunk by chunk and still match the in-memory version exactly.
+"""
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+BLOCK_ROWS = 65_536
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+DISTRIBUTIONS = {
+    "normal": lambda rng, n: rng.standard_normal(n),
+    "uniform": lambda rng, n: rng.random(n),
+    "integer": lambda rng, n: rng.integers(0, 100, n),
+}
+
+
+def _tabular_block(rng, n, start, columns):
+    return pd.DataFrame({name: DISTRIBUTIONS[dist](rng, n) for name, dist in columns.items()})
+
+
+def _timeseries_block(rng, n, start, columns, start_time, freq):
+    offset = pd.tseries.frequencies.to_offset(freq)
+    index = pd.date_range(pd.Timestamp(start_time) + start * offset, periods=n, freq=offset)
+    steps = {name: rng.standard_normal(n) for name in columns}
+    return pd.DataFrame(steps, index=index)
+
+
+def _geospatial_block(rng, n, start, center, spread):
+    return pd.DataFrame({
+        "lat": rng.normal(center[0], spread, n),
+        "lon": rng.normal(center[1], spread, n),
+    })
+
+
+def _blocks(kind, rows, seed, **params):
+    for block, start in enumerate(range(0, rows, BLOCK_ROWS)):
+        n = min(BLOCK_ROWS, rows - start)
+        rng = np.random.default_rng((seed, block))
+        if kind == "tabular":
+            yield _tabular_block(rng, n, start, **params)
+        elif kind == "timeseries":
+            yield _timeseries_block(rng, n, start, **params)
+        elif kind == "geospatial":
+            yield _geospatial_block(rng, n, start, **params)
+        else:
+            raise ValueError(f"Unknown dataset kind: {kind!r}")
+
+
+def _normalise(kind, params):
+    params = dict(params)
+    if kind in ("tabular", "timeseries"):
+        columns = params.get("columns", ["A", "B", "C"])
+        if not isinstance(columns, dict):
+            columns = {name: "normal" for name in columns}
+        params["columns"] = columns
+    if kind == "timeseries":
+        params.setdefault("start_time", "2024-01-01")
+        params.setdefault("freq", "min")
+    if kind == "geospatial":
+        params.setdefault("center", (0.0, 0.0))
+        params.setdefault("spread", 0.01)
+    return params
+
+
+def iter_chunks(kind, rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, **params):
+    """Yield ``rows`` rows of ``kind`` data as DataFrames of ``chunk_rows`` rows.
+
+    Kinds and their parameters:
+    - ``"tabular"``: ``columns`` as a list (all normal) or a dict of
+      column -> ``"normal"``/``"uniform"``/``"integer"``.
+    - ``"timeseries"``: random walks for ``columns`` on a ``DatetimeIndex``
+      starting at ``start_time`` with frequency ``freq``.
+    - ``"geospatial"``: ``lat``/``lon`` normally spread around ``center``.
+    """
+    params = _normalise(kind, params)
+    pending = []
+    pending_rows = 0
+    level = None
+    for block in _blocks(kind, rows, seed, **params):
+        if kind == "timeseries":
+            # Random walk: carry the last level across block boundaries.
+            block = block.cumsum()
+            if level is not None:
+                block += level
+            level = block.iloc[-1]
+        pending.append(block)
+        pending_rows += len(block)
+        while pending_rows >= chunk_rows:
+            combined = pd.concat(pending)
+            yield combined.iloc[:chunk_rows]
+            rest = combined.iloc[chunk_rows:]
+            pending, pending_rows = ([rest], len(rest)) if len(rest) else ([], 0)
+    if pending_rows:
+        yield pd.concat(pending)
+
+
+def generate(kind, rows, seed=0, **params):
+    """The whole dataset in memory (identical to concatenating ``iter_chunks``)."""
+    chunks = list(iter_chunks(kind, rows, seed, chunk_rows=max(rows, 1), **params))
+    df = chunks[0] if chunks else pd.DataFrame()
+    return df if kind == "timeseries" else df.reset_index(drop=True)
+
+
+def write_csv(path, kind, rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, **params):
+    """Stream the dataset to a CSV file without holding it in memory."""
+    path = Path(path)
+    with path.open("w", newline="") as f:
+        for i, chunk in enumerate(iter_chunks(kind, rows, seed, chunk_rows, **params)):
+            chunk.to_csv(f, index=kind == "timeseries", header=i == 0)
+    return path
+
+
+def write_parquet(path, kind, rows, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS, **params):
+    """Stream the dataset to Parquet, one row group per chunk (needs pyarrow)."""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    writer = None
+    try:
+        for chunk in iter_chunks(kind, rows, seed, chunk_rows, **params):
+            table = pa.Table.from_pandas(chunk, preserve_index=kind == "timeseries")
+            if writer is None:
+                writer = pq.ParquetWriter(path, table.schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return path